@@ -0,0 +1,68 @@
+from __future__ import annotations
+import argparse
+import math
+import time
+import numpy as np
+from src.geometry.primitives2d import Point2D
+from src.algorithms.hull2d_incremental import convex_hull_incremental
+from src.algorithms.hull2d_divide_conquer import build_hull_dc, merge_hulls
+
+# Divide and conquer hull vs the same recursion re-canonicalising every step
+# (base case and merge result passed through convex_hull_incremental, which
+# re-sorts and dedupes). Points on a circle keep every point on the hull, so
+# the extra sorting shows as an O(n log^2 n) vs O(n log n) gap.
+# Run from computational_geometry/: python -m benchmarks.bench_hull_dc
+
+SIZES = [1_000, 4_000, 16_000, 64_000, 256_000]
+
+
+def build_hull_dc_resorting(pts_sorted: list[Point2D]) -> list[Point2D]:
+    # Previous behaviour, kept here as the reference
+    n = len(pts_sorted)
+    if n <= 8:
+        return convex_hull_incremental(pts_sorted)
+    mid = n // 2
+    left = build_hull_dc_resorting(pts_sorted[:mid])
+    right = build_hull_dc_resorting(pts_sorted[mid:])
+    return convex_hull_incremental(merge_hulls(left, right))
+
+
+def make_points(rng: np.random.Generator, n: int, kind: str) -> list[Point2D]:
+    # Sorted, duplicate-free points
+    if kind == "circle":
+        t = rng.random(n) * 2 * math.pi
+        xs, ys = np.cos(t), np.sin(t)
+    else:
+        xs, ys = rng.random(n), rng.random(n)
+    return [Point2D(x, y) for x, y in sorted(set(zip(xs.tolist(), ys.tolist())))]
+
+
+def best_time(fn, pts: list[Point2D], repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(pts)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'points':>8} {'n':>9} {'re-sorting':>12} {'direct':>12} {'speedup':>8} {'direct / n log n':>17}")
+    for kind in ("uniform", "circle"):
+        for n in args.sizes:
+            pts = make_points(rng, n, kind)
+            t_old = best_time(build_hull_dc_resorting, pts, args.repeat)
+            t_new = best_time(build_hull_dc, pts, args.repeat)
+            per = t_new / (n * math.log2(n)) * 1e9
+            print(f"{kind:>8} {n:>9} {t_old:>11.3f}s {t_new:>11.3f}s {t_old / t_new:>7.1f}x {per:>14.1f}ns")
+
+
+if __name__ == "__main__":
+    main()
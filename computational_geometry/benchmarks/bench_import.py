@@ -0,0 +1,77 @@
+from __future__ import annotations
+import argparse
+import os
+import subprocess
+import sys
+
+# Cold-start benchmark: each case imports src in a fresh interpreter and
+# touches some public names; the time from `import src` to the last access
+# is compared against a budget, and matplotlib must stay unloaded (only
+# calling a plot function may load it).
+#
+# Run from computational_geometry/:
+#   python -m benchmarks.bench_import --budget 0.5
+# Exits with status 1 if any case is over budget or loaded matplotlib.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES: dict[str, tuple[str, ...]] = {
+    "import": (),
+    "hull2d": ("convex_hull_dc", "PointArray2D"),
+    "hull3d": ("convex_hull_3d_incremental",),
+    "delaunay": ("delaunay_triangulation_lifting", "delaunay_triangulation_incremental"),
+    "lp2d": ("solve_lp_batch", "halfplane_intersection"),
+    "kdtree": ("build_flat_kdtree", "range_search", "knn"),
+    "plotting": ("plot_points_and_hull", "plot_kdtree", "plot_range"),
+    "all": ("__all__",),
+}
+
+CHILD = """
+import sys, time
+t0 = time.perf_counter()
+import src
+for name in sys.argv[1:]:
+    for n in (src.__all__ if name == "__all__" else [name]):
+        getattr(src, n)
+print(time.perf_counter() - t0, "matplotlib" in sys.modules)
+"""
+
+BUDGET = 0.5
+
+
+def cold_start(names: tuple[str, ...], repeat: int) -> tuple[float, bool]:
+    # Best time over fresh interpreters, and whether any of them loaded matplotlib
+    best, mpl = float("inf"), False
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", CHILD, *names], cwd=ROOT, check=True,
+                             capture_output=True, text=True).stdout.split()
+        best = min(best, float(out[0]))
+        mpl = mpl or out[1] == "True"
+    return best, mpl
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES))
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per case (best is kept)")
+    parser.add_argument("--budget", type=float, default=BUDGET, help="allowed cold-start time per case (seconds)")
+    args = parser.parse_args()
+
+    failures: list[str] = []
+    for case in args.cases:
+        t, mpl = cold_start(CASES[case], args.repeat)
+        print(f"{case:<10} {t * 1000:8.1f} ms{'  matplotlib loaded' if mpl else ''}")
+        if t > args.budget:
+            failures.append(f"{case}: {t:.3f}s > {args.budget:.3f}s")
+        if mpl:
+            failures.append(f"{case}: matplotlib loaded on import")
+
+    for line in failures:
+        print("OVER BUDGET", line)
+    if failures:
+        sys.exit(1)
+    print("within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+import argparse
+import time
+import numpy as np
+from src.geometry.point_array import PointArray2D
+from src.algorithms.kdtree import build_flat_kdtree
+from src.algorithms.range_search import Rect, range_search, range_count
+from src.algorithms.range_tree import RangeTree2D
+
+# Range tree vs flat kd-tree on square queries of growing selectivity
+# Run from computational_geometry/: python -m benchmarks.bench_range_tree
+
+SELECTIVITIES = [1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 0.5]
+
+
+def random_queries(rng: np.random.Generator, m: int, sel: float) -> list[Rect]:
+    # Squares covering a `sel` fraction of the unit square
+    side = sel ** 0.5
+    corners = rng.random((m, 2)) * (1.0 - side)
+    return [Rect(x, x + side, y, y + side) for x, y in corners.tolist()]
+
+
+def time_queries(fn, rects: list[Rect]) -> float:
+    # Mean seconds per query
+    t0 = time.perf_counter()
+    for r in rects:
+        fn(r)
+    return (time.perf_counter() - t0) / len(rects)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    pts = PointArray2D(rng.random((2, args.n)))
+
+    t0 = time.perf_counter()
+    kd = build_flat_kdtree(pts)
+    t_kd = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    rt = RangeTree2D(pts)
+    t_rt = time.perf_counter() - t0
+    print(f"n={args.n}  build: kd-tree {t_kd:.3f}s  range tree {t_rt:.3f}s")
+
+    print(f"{'selectivity':>12} {'kd report':>12} {'rt report':>12} {'kd count':>12} {'rt count':>12}")
+    for sel in SELECTIVITIES:
+        rects = random_queries(rng, args.queries, sel)
+        row = [
+            time_queries(lambda r: range_search(kd, r), rects),
+            time_queries(rt.query, rects),
+            time_queries(lambda r: range_count(kd, r), rects),
+            time_queries(rt.count, rects),
+        ]
+        print(f"{sel:>12g} " + " ".join(f"{t * 1e6:>10.1f}us" for t in row))
+
+
+if __name__ == "__main__":
+    main()
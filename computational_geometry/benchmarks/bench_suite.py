@@ -0,0 +1,238 @@
+from __future__ import annotations
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Optional
+import numpy as np
+from src.geometry.instrument import instrument
+from src.geometry.primitives2d import Point2D
+from src.geometry.point_array import PointArray2D, PointArray3D
+from src.geometry.random_points import (uniform_box, uniform_disk, on_circle, gaussian_clusters,
+                                        near_collinear, grid)
+from src.algorithms.hull2d_incremental import convex_hull_incremental
+from src.algorithms.hull2d_jarvis import convex_hull_jarvis
+from src.algorithms.hull2d_divide_conquer import convex_hull_dc
+from src.algorithms.hull2d_quickhull import convex_hull_quickhull
+from src.algorithms.hull2d_chan import convex_hull_chan
+from src.algorithms.hull3d_incremental import convex_hull_3d_incremental
+from src.algorithms.delaunay_lifting import delaunay_triangulation_lifting
+from src.algorithms.kdtree import build_kdtree, build_flat_kdtree
+from src.algorithms.range_search import Rect, range_search
+from src.algorithms.lp2d_incremental import Halfplane, solve_lp_incremental_2d, solve_lp_batch
+
+# Benchmark suite: every algorithm over a sweep of sizes and input
+# distributions. Records wall time, peak traced memory and predicate
+# evaluations per run to JSON, and compares against a stored baseline.
+#
+# Run from computational_geometry/:
+#   python -m benchmarks.bench_suite --out results.json
+#   python -m benchmarks.bench_suite --baseline results.json --threshold 0.25
+# The second form exits with status 1 if any case regressed.
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+DISTRIBUTIONS: dict[str, Callable[[int, int], PointArray2D]] = {
+    "uniform": lambda n, seed: uniform_box(n, seed),
+    "disk": lambda n, seed: uniform_disk(n, seed),
+    "circle": lambda n, seed: on_circle(n, seed),
+    "clusters": lambda n, seed: gaussian_clusters(n, seed),
+    "collinear": lambda n, seed: near_collinear(n, seed),
+    "grid": lambda n, seed: grid(n, seed),
+}
+
+QUERIES = 100          # range queries per kd-tree run
+SELECTIVITY = 1e-3     # fraction of the bounding box each query covers
+# Objective directions per batch LP run
+OBJECTIVES = [(math.cos(t), math.sin(t)) for t in np.linspace(0, 2 * math.pi, 100, endpoint=False).tolist()]
+
+
+@dataclass(slots=True)
+class Case:
+    name: str
+    run: Callable[[object], object]         # timed part
+    prepare: Callable[[PointArray2D, int], object] = lambda pts, seed: pts
+    dists: Optional[tuple[str, ...]] = None   # None: every distribution
+
+
+def _lift_3d(pts: PointArray2D, seed: int) -> PointArray3D:
+    # 3D input: the 2D distribution plus an independent uniform z
+    z = np.random.default_rng(seed).random(len(pts)) * 1000.0
+    return PointArray3D(np.vstack([pts.data, z]))
+
+
+def _kd_input(pts: PointArray2D, seed: int) -> tuple[PointArray2D, list[Rect]]:
+    rng = np.random.default_rng(seed)
+    xmin, xmax, ymin, ymax = pts.x.min(), pts.x.max(), pts.y.min(), pts.y.max()
+    w, h = (xmax - xmin) * SELECTIVITY ** 0.5, (ymax - ymin) * SELECTIVITY ** 0.5
+    corners = rng.random((QUERIES, 2))
+    rects = [Rect(xmin + u * (xmax - xmin - w), xmin + u * (xmax - xmin - w) + w,
+                  ymin + v * (ymax - ymin - h), ymin + v * (ymax - ymin - h) + h)
+             for u, v in corners.tolist()]
+    return pts, rects
+
+
+def _kd_run(build: Callable) -> Callable:
+    def run(arg: tuple[PointArray2D, list[Rect]]) -> None:
+        pts, rects = arg
+        tree = build(pts)
+        for r in rects:
+            range_search(tree, r)
+    return run
+
+
+def _lp_input(pts: PointArray2D, seed: int) -> list[Halfplane]:
+    # Halfplanes tangent to a circle of radius 1..1.1 at random angles: bounded and feasible
+    u = np.random.default_rng(seed).random((len(pts), 2))
+    t = 2 * math.pi * u[:, 0]
+    return [Halfplane(a, b, c) for a, b, c in zip(np.cos(t).tolist(), np.sin(t).tolist(), (1 + 0.1 * u[:, 1]).tolist())]
+
+
+CASES = [
+    Case("hull2d.incremental", convex_hull_incremental),
+    Case("hull2d.jarvis", convex_hull_jarvis),
+    Case("hull2d.dc", convex_hull_dc),
+    Case("hull2d.quickhull", convex_hull_quickhull),
+    Case("hull2d.chan", convex_hull_chan),
+    Case("hull3d.incremental", convex_hull_3d_incremental, _lift_3d, ("uniform", "clusters")),
+    Case("delaunay.lifting", lambda P: delaunay_triangulation_lifting(P, method="lifting")),
+    Case("delaunay.incremental", lambda P: delaunay_triangulation_lifting(P, method="incremental")),
+    Case("kdtree.build_range", _kd_run(build_kdtree), _kd_input),
+    Case("kdtree.flat_build_range", _kd_run(build_flat_kdtree), _kd_input),
+    Case("lp2d.incremental", lambda H: solve_lp_incremental_2d(H, 1.0, 0.5), _lp_input, ("uniform",)),
+    Case("lp2d.batch", lambda H: solve_lp_batch(H, OBJECTIVES), _lp_input, ("uniform",)),
+]
+
+@dataclass(slots=True)
+class Result:
+    case: str
+    dist: str
+    n: int
+    time: Optional[float] = None       # best wall time in seconds
+    peak_mem: Optional[int] = None     # peak traced allocation in bytes
+    predicates: dict[str, int] = field(default_factory=dict)
+    phases: dict[str, float] = field(default_factory=dict)   # seconds per instrumented phase
+    error: Optional[str] = None
+
+
+def measure(case: Case, dist: str, n: int, seed: int, repeat: int, as_lists: bool) -> Result:
+    res = Result(case.name, dist, n)
+    pts = DISTRIBUTIONS[dist](n, seed)
+    arg = case.prepare(pts, seed)
+    if as_lists and isinstance(arg, (PointArray2D, PointArray3D)):
+        arg = arg.to_points()
+    try:
+        best = math.inf
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            case.run(arg)
+            best = min(best, time.perf_counter() - t0)
+        res.time = best
+
+        # Memory and counts in a separate run: tracing slows everything down
+        tracemalloc.start()
+        with instrument() as stats:
+            case.run(arg)
+        res.peak_mem = tracemalloc.get_traced_memory()[1]
+        res.predicates = dict(stats.calls)
+        res.phases = dict(stats.time)
+    except Exception as e:   # record and move on to the next case
+        res.error = f"{type(e).__name__}: {e}"
+    finally:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+    return res
+
+
+def run_suite(cases: list[Case], dists: list[str], sizes: list[int], seed: int, repeat: int,
+              budget: float, as_lists: bool) -> list[Result]:
+    results: list[Result] = []
+    for case in cases:
+        for dist in dists:
+            if case.dists is not None and dist not in case.dists:
+                continue
+            last: Optional[Result] = None
+            for n in sorted(sizes):
+                # Skip sizes the previous timing says would blow the budget
+                if last is not None and (last.error or last.time * n / last.n > budget):
+                    print(f"{case.name:<24} {dist:<10} {n:>9}  skipped")
+                    continue
+                last = measure(case, dist, n, seed, repeat, as_lists)
+                results.append(last)
+                print(format_result(last), flush=True)
+    return results
+
+
+def format_result(r: Result) -> str:
+    head = f"{r.case:<24} {r.dist:<10} {r.n:>9}"
+    if r.error:
+        return f"{head}  error: {r.error}"
+    preds = " ".join(f"{k}={v}" for k, v in sorted(r.predicates.items()))
+    return f"{head} {r.time:>10.4f}s {r.peak_mem / 2**20:>9.1f}MB  {preds}"
+
+
+def compare(results: list[Result], baseline: list[dict], threshold: float, min_time: float) -> list[str]:
+    # Regressions of time, peak memory or predicate counts past the threshold
+    base = {(b["case"], b["dist"], b["n"]): b for b in baseline}
+    out: list[str] = []
+    for r in results:
+        b = base.get((r.case, r.dist, r.n))
+        if b is None or r.error or b.get("error"):
+            continue
+        key = f"{r.case} {r.dist} n={r.n}"
+        if r.time > b["time"] * (1 + threshold) and r.time - b["time"] > min_time:
+            out.append(f"{key}: time {b['time']:.4f}s -> {r.time:.4f}s")
+        if r.peak_mem > b["peak_mem"] * (1 + threshold):
+            out.append(f"{key}: peak memory {b['peak_mem']} -> {r.peak_mem} bytes")
+        for name, cnt in r.predicates.items():
+            old = b["predicates"].get(name, 0)
+            if cnt > old * (1 + threshold):
+                out.append(f"{key}: {name} {old} -> {cnt} calls")
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--dists", nargs="+", default=list(DISTRIBUTIONS), choices=list(DISTRIBUTIONS))
+    parser.add_argument("--cases", nargs="+", default=None,
+                        help="case names or prefixes, e.g. hull2d or kdtree.flat_build_range")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per case (best is kept)")
+    parser.add_argument("--budget", type=float, default=60.0,
+                        help="skip larger sizes once a case is predicted to take longer (seconds)")
+    parser.add_argument("--lists", action="store_true", help="pass Point2D/Point3D lists instead of arrays")
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--min-time", type=float, default=0.005,
+                        help="ignore time regressions smaller than this (seconds)")
+    args = parser.parse_args()
+
+    cases = [c for c in CASES if args.cases is None
+             or any(c.name == p or c.name.startswith(p + ".") for p in args.cases)]
+    results = run_suite(cases, args.dists, args.sizes, args.seed, args.repeat, args.budget, args.lists)
+
+    if args.out:
+        meta = {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+                "date": time.strftime("%Y-%m-%dT%H:%M:%S"), "seed": args.seed, "lists": args.lists}
+        with open(args.out, "w") as f:
+            json.dump({"meta": meta, "results": [asdict(r) for r in results]}, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold, args.min_time)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            sys.exit(1)
+        print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+import importlib
+
+# Public API: `from src import convex_hull_dc` instead of the deep module
+# paths. Each name imports its module on first access (module __getattr__),
+# so `import src` loads nothing and a worker pays only for what it uses;
+# matplotlib loads when a plot function is first called.
+
+_EXPORTS: dict[str, tuple[str, ...]] = {
+    "src.geometry.primitives2d": ("Point2D",),
+    "src.geometry.primitives3d": ("Point3D",),
+    "src.geometry.point_array": ("PointArray2D", "PointArray3D"),
+    "src.geometry.point_file": ("create_points", "write_points", "append_points", "open_points",
+                                "point_array", "iter_chunks", "load_points"),
+    "src.geometry.predicates": ("ccw", "orient3d", "incircle", "ccw_batch", "orient3d_batch", "incircle_batch"),
+    "src.geometry.random_points": ("random_points_2d", "random_points_3d", "uniform_box", "uniform_disk",
+                                   "on_circle", "gaussian_clusters", "near_collinear", "grid"),
+    "src.geometry.instrument": ("instrument",),
+    "src.geometry.plotting": ("plot_points_and_hull", "plot_kdtree", "plot_range"),
+    "src.algorithms.hull2d_incremental": ("convex_hull_incremental",),
+    "src.algorithms.hull2d_jarvis": ("convex_hull_jarvis",),
+    "src.algorithms.hull2d_divide_conquer": ("convex_hull_dc",),
+    "src.algorithms.hull2d_quickhull": ("convex_hull_quickhull",),
+    "src.algorithms.hull2d_chan": ("convex_hull_chan",),
+    "src.algorithms.hull2d_prefilter": ("akl_toussaint",),
+    "src.algorithms.hull2d_online": ("OnlineHull2D",),
+    "src.algorithms.hull2d_file": ("convex_hull_file",),
+    "src.algorithms.hull3d_incremental": ("convex_hull_3d_incremental",),
+    "src.algorithms.delaunay_lifting": ("delaunay_triangulation_lifting", "triangulation_edges"),
+    "src.algorithms.delaunay_incremental": ("delaunay_triangulation_incremental", "build_delaunay_mesh",
+                                            "DelaunayMesh"),
+    "src.algorithms.lp2d_incremental": ("Halfplane", "to_leq", "LPResult", "solve_lp_incremental_2d",
+                                        "solve_lp_batch"),
+    "src.algorithms.halfplane_intersection": ("FeasibleRegion", "halfplane_intersection"),
+    "src.algorithms.kdtree": ("KDNode", "FlatKDTree", "build_kdtree", "build_flat_kdtree"),
+    "src.algorithms.kdtree_dynamic": ("DynamicKDTree",),
+    "src.algorithms.kdtree_file": ("FileKDTree", "build_kdtree_file"),
+    "src.algorithms.range_search": ("Rect", "range_search", "range_count", "range_search_batch"),
+    "src.algorithms.range_tree": ("RangeTree2D",),
+    "src.algorithms.nearest_neighbor": ("nearest", "knn", "radius_search", "knn_batch"),
+    "src.algorithms.result_cache": ("ResultCache", "CacheStats"),
+}
+
+_MODULE = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULE)
+
+
+def __getattr__(name: str):
+    module = _MODULE.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value     # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
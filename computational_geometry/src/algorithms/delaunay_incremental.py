@@ -0,0 +1,345 @@
+from __future__ import annotations
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+import numpy as np
+from src.geometry.primitives2d import Point2D
+from src.geometry.point_array import PointArray2D, unique_sorted_indices
+from src.geometry.predicates import ccw_xy, incircle_xy
+from src.geometry.instrument import active, add_time, phase
+
+Tri = tuple[int, int, int]
+GHOST = -1   # vertex "at infinity": ghost triangle (u, v, GHOST) sits outside hull edge u->v
+NEXT = (1, 2, 0)    # edge i of a triangle runs from vertex NEXT[i] to vertex PREV[i]
+PREV = (2, 0, 1)
+
+
+def hilbert_index(xs: np.ndarray, ys: np.ndarray, bits: int = 16) -> np.ndarray:
+    # Position of each point along a Hilbert curve over its bounding box
+    side = (1 << bits) - 1
+    span = max(float(xs.max() - xs.min()), float(ys.max() - ys.min()), 1e-300)
+    x = ((xs - xs.min()) / span * side).astype(np.int64)
+    y = ((ys - ys.min()) / span * side).astype(np.int64)
+
+    d = np.zeros(len(x), dtype=np.int64)
+    s = 1 << (bits - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # Rotate the quadrant so the sub-curve has the canonical orientation
+        flip = ~ry
+        swap_back = flip & rx
+        x = np.where(swap_back, side - x, x)
+        y = np.where(swap_back, side - y, y)
+        x, y = np.where(flip, y, x), np.where(flip, x, y)
+        s >>= 1
+    return d
+
+
+def brio_order(xs: np.ndarray, ys: np.ndarray, seed: Optional[int] = 0) -> np.ndarray:
+    # Biased randomized insertion order: random rounds of doubling size,
+    # each round sorted along a Hilbert curve
+    n = len(xs)
+    perm = np.random.default_rng(seed).permutation(n)
+    h = hilbert_index(xs, ys) if n else np.zeros(0, dtype=np.int64)
+
+    order: list[np.ndarray] = []
+    lo = 0
+    while lo < n:
+        hi = min(n, max(2 * lo, 8))
+        chunk = perm[lo:hi]
+        order.append(chunk[np.argsort(h[chunk], kind="stable")])
+        lo = hi
+    return np.concatenate(order) if order else perm
+
+
+class DelaunayMesh:
+    # Bowyer-Watson triangulation over fixed coordinate lists.
+    # Triangle t has vertices tv[3t:3t+3] in CCW order and tn[3t+i] is the
+    # neighbour across the edge opposite vertex i. Hull edges are closed off
+    # by ghost triangles, so every triangle has three neighbours.
+
+    def __init__(self, xs: list[float], ys: list[float], seed: Optional[int] = 0) -> None:
+        self.xs = xs
+        self.ys = ys
+        self.rng = random.Random(seed)   # first edge tried by the walk
+        self.tv: list[int] = []
+        self.tn: list[int] = []
+        self.alive: list[bool] = []
+        self.free: list[int] = []
+        self.last = -1   # walk starts here (most recently created triangle)
+
+    # -- predicates on vertex ids --
+
+    def ccw(self, a: int, b: int, c: int) -> float:
+        xs, ys = self.xs, self.ys
+        return ccw_xy(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c])
+
+    def incircle(self, a: int, b: int, c: int, d: int) -> float:
+        xs, ys = self.xs, self.ys
+        return incircle_xy(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c], xs[d], ys[d])
+
+    def conflict(self, t: int, p: int) -> bool:
+        # Does p lie inside the circumcircle of t (the outer halfplane for a ghost)?
+        a, b, c = self.tv[3 * t : 3 * t + 3]
+        if a != GHOST and b != GHOST and c != GHOST:
+            return self.incircle(a, b, c, p) > 0
+        if a == GHOST:
+            a, b = b, c
+        elif b == GHOST:
+            a, b = c, a
+        s = self.ccw(a, b, p)
+        if s != 0:
+            return s > 0
+        # On the hull line: conflict only inside the segment
+        xs, ys = self.xs, self.ys
+        return (xs[p] - xs[a]) * (xs[p] - xs[b]) + (ys[p] - ys[a]) * (ys[p] - ys[b]) < 0
+
+    # -- triangle storage --
+
+    def new_tri(self, a: int, b: int, c: int) -> int:
+        if self.free:
+            t = self.free.pop()
+            self.tv[3 * t : 3 * t + 3] = (a, b, c)
+            self.tn[3 * t : 3 * t + 3] = (-1, -1, -1)
+            self.alive[t] = True
+        else:
+            t = len(self.alive)
+            self.tv.extend((a, b, c))
+            self.tn.extend((-1, -1, -1))
+            self.alive.append(True)
+        return t
+
+    def is_ghost(self, t: int) -> bool:
+        return GHOST in self.tv[3 * t : 3 * t + 3]
+
+    def start(self, a: int, b: int, c: int) -> list[int]:
+        # First triangle plus its three ghosts
+        if self.ccw(a, b, c) < 0:
+            b, c = c, b
+        tris = [self.new_tri(a, b, c), self.new_tri(b, a, GHOST),
+                self.new_tri(c, b, GHOST), self.new_tri(a, c, GHOST)]
+
+        by_edge: dict[tuple[int, int], tuple[int, int]] = {}
+        for t in tris:
+            for i in range(3):
+                u, v = self.tv[3 * t + (i + 1) % 3], self.tv[3 * t + (i + 2) % 3]
+                by_edge[(u, v)] = (t, i)
+        for (u, v), (t, i) in by_edge.items():
+            self.tn[3 * t + i] = by_edge[(v, u)][0]
+
+        self.last = tris[0]
+        return tris
+
+    # -- insertion --
+
+    def locate(self, p: int) -> int:
+        # Visibility walk from the last created triangle; stops at a triangle
+        # containing p or at the ghost beyond the hull edge p lies outside of.
+        # Coordinates and links are read from local lists, and the edge tried
+        # first comes from one random() call per step.
+        tv, tn, xs, ys = self.tv, self.tn, self.xs, self.ys
+        ccw, rnd = ccw_xy, self.rng.random
+        t = self.last
+        if not self.alive[t] or self.is_ghost(t):
+            t = next(k for k in range(len(self.alive)) if self.alive[k] and not self.is_ghost(k))
+        px, py = xs[p], ys[p]
+        while True:
+            b = 3 * t
+            off = int(rnd() * 3)
+            for i in (off, (off + 1) % 3, (off + 2) % 3):
+                u, v = tv[b + NEXT[i]], tv[b + PREV[i]]
+                if ccw(xs[u], ys[u], xs[v], ys[v], px, py) < 0:
+                    t = tn[b + i]
+                    break
+            else:
+                return t
+            b = 3 * t
+            if tv[b] == GHOST or tv[b + 1] == GHOST or tv[b + 2] == GHOST:
+                return t
+
+    def insert(self, p: int) -> tuple[list[Tri], list[Tri]]:
+        # Insert vertex p; returns the removed and added triangles (ghosts included)
+        removed: list[Tri] = []
+        added = self.add(p, removed)
+        return removed, [self.triangle(t) for t in added]
+
+    def add(self, p: int, removed: Optional[list[Tri]] = None) -> list[int]:
+        # Insert vertex p and return the ids of the new triangles; the removed
+        # ones are appended to removed if given. Solid triangles are tested
+        # with incircle_xy inline, only ghosts go through conflict().
+        timed = active() is not None
+        if timed:
+            s0 = time.perf_counter()
+        t0 = self.locate(p)
+        tv, tn, xs, ys, alive, free = self.tv, self.tn, self.xs, self.ys, self.alive, self.free
+        incircle = incircle_xy
+        if timed:
+            s1 = time.perf_counter()
+            add_time("locate", s1 - s0)
+
+        # Cavity: all triangles whose circumcircle contains p, grown from t0
+        px, py = xs[p], ys[p]
+        cavity = [t0]
+        in_cavity = {t0}
+        boundary: list[tuple[int, int, int]] = []   # (u, v, outside neighbour)
+        for t in cavity:
+            b = 3 * t
+            for i in range(3):
+                nb = tn[b + i]
+                if nb in in_cavity:
+                    continue
+                a, c, d = tv[3 * nb], tv[3 * nb + 1], tv[3 * nb + 2]
+                if a != GHOST and c != GHOST and d != GHOST:
+                    hit = incircle(xs[a], ys[a], xs[c], ys[c], xs[d], ys[d], px, py) > 0
+                else:
+                    hit = self.conflict(nb, p)
+                if hit:
+                    in_cavity.add(nb)
+                    cavity.append(nb)
+                else:
+                    boundary.append((tv[b + NEXT[i]], tv[b + PREV[i]], nb))
+
+        if removed is not None:
+            removed.extend(self.triangle(t) for t in cavity)
+        for t in cavity:
+            alive[t] = False
+        free.extend(cavity)
+
+        # Star the cavity from p, reusing freed slots
+        added: list[int] = []
+        by_start: dict[int, int] = {}
+        for u, v, nb in boundary:
+            if free:
+                t = free.pop()
+                b = 3 * t
+                tv[b], tv[b + 1], tv[b + 2] = u, v, p
+                tn[b + 2] = nb
+                alive[t] = True
+            else:
+                t = len(alive)
+                tv += (u, v, p)
+                tn += (-1, -1, nb)
+                alive.append(True)
+            b = 3 * nb
+            if tv[b + 1] == v and tv[b + 2] == u:
+                tn[b] = t
+            elif tv[b + 2] == v and tv[b] == u:
+                tn[b + 1] = t
+            else:
+                tn[b + 2] = t
+            by_start[u] = t
+            added.append(t)
+
+        for t in added:
+            nxt = by_start[tv[3 * t + 1]]
+            tn[3 * t] = nxt
+            tn[3 * nxt + 1] = t
+
+        self.last = next((t for t in added if tv[3 * t] != GHOST and tv[3 * t + 1] != GHOST), added[0])
+        if timed:
+            add_time("cavity", time.perf_counter() - s1)
+        return added
+
+    def triangle(self, t: int) -> Tri:
+        return tuple(self.tv[3 * t : 3 * t + 3])
+
+    def triangles(self) -> list[Tri]:
+        # Solid triangles, clockwise like the lower faces of the lifted hull
+        tv = self.tv
+        return [(tv[3 * t], tv[3 * t + 2], tv[3 * t + 1])
+                for t in range(len(self.alive))
+                if self.alive[t] and GHOST not in tv[3 * t : 3 * t + 3]]
+
+    @staticmethod
+    def solid(tris: list[Tri]) -> list[Tri]:
+        # Drop ghosts and flip to the clockwise convention of triangles()
+        return [(a, c, b) for a, b, c in tris if a != GHOST and b != GHOST and c != GHOST]
+
+
+def build_delaunay_mesh(xs: list[float], ys: list[float], order: list[int], seed: Optional[int] = 0) -> Optional[DelaunayMesh]:
+    # Insert vertices in the given order; None when all points are collinear
+    mesh = DelaunayMesh(xs, ys, seed)
+    if len(order) < 3:
+        return None
+    a, b = order[0], order[1]
+    k = next((k for k in range(2, len(order)) if mesh.ccw(a, b, order[k]) != 0), None)
+    if k is None:
+        return None
+
+    mesh.start(a, b, order[k])
+    for p in order[2:k] + order[k + 1 :]:
+        mesh.add(p)
+    return mesh
+
+
+def delaunay_triangulation_incremental(points: list[Point2D] | PointArray2D, seed: Optional[int] = 0) -> tuple[list[Point2D], list[Tri]] | tuple[PointArray2D, np.ndarray]:
+    # Direct 2D Delaunay triangulation (Bowyer-Watson, BRIO/Hilbert insertion order)
+    if isinstance(points, PointArray2D):
+        with phase("sort"):
+            uniq = unique_sorted_indices(points)
+        sub = points.take(uniq)
+        tris = _delaunay_indices(sub.x, sub.y, seed)
+        return points, uniq[np.asarray(tris, dtype=np.intp).reshape(-1, 3)]
+
+    with phase("sort"):
+        uniq_xy = sorted(set((p.x, p.y) for p in points))
+    pts2 = [Point2D(x, y) for x, y in uniq_xy]
+    if len(pts2) < 3:
+        return pts2, []
+
+    xs = np.array([x for x, _ in uniq_xy])
+    ys = np.array([y for _, y in uniq_xy])
+    return pts2, _delaunay_indices(xs, ys, seed)
+
+
+def _delaunay_indices(xs: np.ndarray, ys: np.ndarray, seed: Optional[int]) -> list[Tri]:
+    if len(xs) < 3:
+        return []
+    with phase("order"):
+        order = brio_order(xs, ys, seed).tolist()
+    mesh = build_delaunay_mesh(xs.tolist(), ys.tolist(), order, seed)
+    return [] if mesh is None else mesh.triangles()
+
+
+@dataclass(frozen=True, slots=True)
+class DelaunayStep:
+    # Delta after one insertion; triangles use the convention of DelaunayMesh.triangles
+    k: int                  # points triangulated so far (pts[:k])
+    vertex: int             # index of the inserted point
+    removed: list[Tri]
+    added: list[Tri]
+    mesh: DelaunayMesh = field(repr=False, compare=False)
+
+    def triangles(self) -> list[Tri]:
+        # Full snapshot, built on demand; only valid until the generator advances
+        return self.mesh.triangles()
+
+
+def delaunay_insertion_steps(pts: list[Point2D], start: int = 3) -> Iterator[DelaunayStep]:
+    # Insert pts in the given order on one live mesh and yield each delta.
+    # The first step covers pts[:start] at once (all of it is "added").
+    xs = [p.x for p in pts]
+    ys = [p.y for p in pts]
+    mesh = DelaunayMesh(xs, ys)
+    seeded = False
+    j = 2   # next candidate for a point off the line through pts[0], pts[1]
+
+    for k in range(max(start, 3), len(pts) + 1):
+        if seeded:
+            removed, added = mesh.insert(k - 1)
+            yield DelaunayStep(k, k - 1, mesh.solid(removed), mesh.solid(added), mesh)
+            continue
+
+        # Still collinear so far: seed the mesh once a non-collinear point shows up
+        while j < k and mesh.ccw(0, 1, j) == 0:
+            j += 1
+        if j < k:
+            mesh.start(0, 1, j)
+            for p in range(2, k):
+                if p != j:
+                    mesh.insert(p)
+            seeded = True
+        yield DelaunayStep(k, k - 1, [], mesh.triangles(), mesh)
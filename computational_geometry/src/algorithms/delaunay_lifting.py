@@ -1,11 +1,14 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Iterable, Iterator
+import numpy as np
 from src.geometry.primitives2d import Point2D
 from src.geometry.primitives3d import Point3D
+from src.geometry.point_array import PointArray2D, PointArray3D, unique_sorted_indices
+from src.geometry.predicates import ccw_xy, ccw_batch
 from src.algorithms.hull3d_incremental import convex_hull_3d_incremental
+from src.algorithms.delaunay_incremental import delaunay_triangulation_incremental, delaunay_insertion_steps
 
-EPS = 1e-9
 Tri = tuple[int, int, int]
 Edge = tuple[int, int]
 
@@ -15,12 +18,20 @@ def lift(p: Point2D) -> Point3D:
 
 
 def normal_z(a: Point3D, b: Point3D, c: Point3D) -> float:
-    abx, aby = b.x - a.x, b.y - a.y
-    acx, acy = c.x - a.x, c.y - a.y
-    return abx * acy - aby * acx
+    # z of the face normal: the orientation of its xy projection (exact sign)
+    return ccw_xy(a.x, a.y, b.x, b.y, c.x, c.y)
 
 
-def delaunay_triangulation_lifting(points: list[Point2D]) -> tuple[list[Point2D], list[Tri]]:
+def delaunay_triangulation_lifting(points: list[Point2D] | PointArray2D, method: str = "lifting") -> tuple[list[Point2D], list[Tri]] | tuple[PointArray2D, np.ndarray]:
+    # method="incremental" skips the lift and runs the direct 2D Bowyer-Watson engine
+    if method == "incremental":
+        return delaunay_triangulation_incremental(points)
+    if method != "lifting":
+        raise ValueError("method must be 'lifting' or 'incremental'")
+
+    if isinstance(points, PointArray2D):
+        return delaunay_lifting_indices(points)
+
     # Remove duplicates
     uniq_xy = sorted(set((p.x, p.y) for p in points))
     pts2_in = [Point2D(x, y) for x, y in uniq_xy]
@@ -36,12 +47,28 @@ def delaunay_triangulation_lifting(points: list[Point2D]) -> tuple[list[Point2D]
     lower_faces: list[Tri] = []
     for (i, j, k) in faces:
         nz = normal_z(pts3[i], pts3[j], pts3[k])
-        if nz < -EPS:
+        if nz < 0:
             lower_faces.append((i, j, k))
 
     return pts2, lower_faces
 
 
+def delaunay_lifting_indices(points: PointArray2D) -> tuple[PointArray2D, np.ndarray]:
+    # Array input: triangles come back as an (m, 3) index array into points
+    order = unique_sorted_indices(points)
+    if len(order) < 3:
+        return points, np.empty((0, 3), dtype=np.intp)
+
+    xs, ys = points.x[order], points.y[order]
+    lifted = PointArray3D.from_xyz(xs, ys, xs * xs + ys * ys)
+    _, faces = convex_hull_3d_incremental(lifted)
+
+    # Keep only lower hull faces (vectorized normal_z)
+    P = PointArray2D.from_xy(xs, ys)
+    nz = ccw_batch(P.take(faces[:, 0]), P.take(faces[:, 1]), P.take(faces[:, 2]))
+    return points, order[faces[nz < 0]]
+
+
 # Unique undirected edges from triangles
 def triangulation_edges(tris: Iterable[Tri]) -> list[Edge]:
     edges: set[Edge] = set()
@@ -55,13 +82,11 @@ def triangulation_edges(tris: Iterable[Tri]) -> list[Edge]:
     return sorted(edges)
 
 
-def delaunay_lifting_steps(points: list[Point2D], start: int = 3) -> list[tuple[list[Point2D], list[Tri]]]:
-    # Recompute triangulation after each insertion
+def delaunay_lifting_steps(points: list[Point2D], start: int = 3) -> Iterator[tuple[list[Point2D], list[Tri]]]:
+    # Triangulation after each insertion, replayed on one live mesh;
+    # snapshots are produced lazily, one per step
     uniq_xy = sorted(set((p.x, p.y) for p in points))
     pts = [Point2D(x, y) for x, y in uniq_xy]
 
-    steps: list[tuple[list[Point2D], list[Tri]]] = []
-    for k in range(max(start, 3), len(pts) + 1):
-        pts2, tris = delaunay_triangulation_lifting(pts[:k])
-        steps.append((pts2, tris))
-    return steps
+    for step in delaunay_insertion_steps(pts, start):
+        yield pts[: step.k], step.triangles()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from typing import List
+import math
+from src.geometry.primitives2d import Point2D
+from src.geometry.predicates import det2
+from src.algorithms.lp2d_incremental import Halfplane, LPResult, intersect_lines
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class FeasibleRegion:
+    # status is "bounded", "unbounded" (clipped to the bounding box of
+    # solve_lp_incremental_2d) or "infeasible" (no vertices). Vertices run
+    # clockwise from the lowest-leftmost one, like the 2D hulls; edges[k] is
+    # the constraint from vertices[k] to vertices[k + 1].
+    status: str
+    vertices: List[Point2D]
+    edges: List[Halfplane]
+    box: List[bool]             # per edge: True for a bounding box edge
+    turns: np.ndarray           # clockwise turn of each edge normal from edges[0]'s, ascending
+
+    def maximize(self, c1: float, c2: float) -> LPResult:
+        # Optimal vertex for (c1, c2) in O(log n): the objective falls between
+        # the normals of the two edges at its optimal vertex
+        n = len(self.vertices)
+        if n == 0:
+            return LPResult("infeasible", None)
+        if c1 == 0 and c2 == 0:
+            return LPResult("optimal", self.vertices[0])
+
+        first = self.edges[0]
+        s = (math.atan2(first.b, first.a) - math.atan2(c2, c1)) % (2 * math.pi)
+        k = int(np.searchsorted(self.turns, s)) % n
+
+        # Rounding in the angles can land next to the optimum
+        V = self.vertices
+        f = lambda p: c1 * p.x + c2 * p.y
+        while f(V[(k + 1) % n]) > f(V[k]):
+            k = (k + 1) % n
+        while f(V[k - 1]) > f(V[k]):
+            k = (k - 1) % n
+
+        status = "optimal"
+        if self.status == "unbounded":
+            # A box edge carrying part of the objective limits the optimum
+            g, h = self.edges[k - 1], self.edges[k]
+            d = _sign(det2(g.a, g.b, h.a, h.b))
+            lg, lh = _sign(det2(c1, c2, h.a, h.b)) * d, _sign(det2(g.a, g.b, c1, c2)) * d
+            if (self.box[k - 1] and lg > 0) or (self.box[k] and lh > 0):
+                status = "unbounded"
+        return LPResult(status, V[k])
+
+
+def _sign(v: float) -> int:
+    return (v > 0) - (v < 0)
+
+
+def _sorted_unique(H: List[Halfplane]) -> List[Halfplane]:
+    # Sort by the angle of the outward normal (a, b); of parallel constraints
+    # facing the same way keep only the tightest
+    if any(h.a == 0 and h.b == 0 for h in H):
+        raise ValueError("Invalid constraint: a=b=0")
+    A = np.array([h.a for h in H], dtype=np.float64)
+    B = np.array([h.b for h in H], dtype=np.float64)
+    C = np.array([h.c for h in H], dtype=np.float64)
+    order = np.lexsort((C / np.hypot(A, B), np.arctan2(B, A)))
+
+    out: List[Halfplane] = []
+    for h in (H[i] for i in order.tolist()):
+        if out:
+            g = out[-1]
+            if det2(g.a, g.b, h.a, h.b) == 0 and g.a * h.a + g.b * h.b > 0:
+                continue
+        out.append(h)
+    return out
+
+
+def _spans(H: List[Halfplane]) -> bool:
+    # Sorted normals with every gap below pi positively span the plane, so
+    # the region (if not empty) is bounded
+    if len(H) < 3:
+        return False
+    return all(det2(g.a, g.b, h.a, h.b) > 0 for g, h in zip(H, H[1:] + H[:1]))
+
+
+def _intersect_sorted(H: List[Halfplane]) -> List[Halfplane] | None:
+    # Deque pass over constraints sorted by normal angle: the constraints
+    # that bound the region, in counter-clockwise order, or None if empty
+    dq: deque[Halfplane] = deque()
+    for h in H:
+        while len(dq) >= 2 and not h.ok(intersect_lines(dq[-1], dq[-2])):
+            dq.pop()
+        while len(dq) >= 2 and not h.ok(intersect_lines(dq[0], dq[1])):
+            dq.popleft()
+        if dq and det2(dq[-1].a, dq[-1].b, h.a, h.b) <= 0:
+            # Facing or turning back past the last boundary: nothing is left
+            return None
+        dq.append(h)
+
+    while len(dq) >= 3 and not dq[0].ok(intersect_lines(dq[-1], dq[-2])):
+        dq.pop()
+    while len(dq) >= 3 and not dq[-1].ok(intersect_lines(dq[0], dq[1])):
+        dq.popleft()
+    if len(dq) < 3 or det2(dq[-1].a, dq[-1].b, dq[0].a, dq[0].b) <= 0:
+        return None
+    return list(dq)
+
+
+def halfplane_intersection(constraints: List[Halfplane] | np.ndarray) -> FeasibleRegion:
+    # Intersection of all constraints (Halfplanes, e.g. from to_leq, or an
+    # (n, 3) array of a, b, c) as a convex polygon, in O(n log n)
+    if isinstance(constraints, np.ndarray):
+        H = [Halfplane(a, b, c) for a, b, c in np.asarray(constraints, dtype=np.float64).reshape(-1, 3).tolist()]
+    else:
+        H = list(constraints)
+    if not H:
+        raise ValueError("No constraints given.")
+
+    # Box size from all constraints, before parallel ones are dropped, so it
+    # matches the LP solvers' box
+    M = 1000.0 * max(1.0, max(abs(h.c) for h in H))
+    H = _sorted_unique(H)
+    status = "bounded"
+    box: List[Halfplane] = []
+    if not _spans(H):
+        # Unbounded or empty: clip to the LP bounding box to tell them apart
+        status = "unbounded"
+        box = [Halfplane(1, 0, M), Halfplane(-1, 0, M), Halfplane(0, 1, M), Halfplane(0, -1, M)]
+        H = _sorted_unique(H + box)
+
+    L = _intersect_sorted(H)
+    if L is None:
+        return FeasibleRegion("infeasible", [], [], [], np.empty(0))
+
+    # Vertex i joins L[i] and L[i + 1]; clockwise, vertex i leaves along L[i].
+    # Zero-length edges of degenerate regions are dropped.
+    m = len(L)
+    V = [intersect_lines(L[i], L[(i + 1) % m]) for i in range(m)]
+    pairs = [(V[i], L[i]) for i in range(m - 1, -1, -1) if V[i] != V[i - 1]] or [(V[0], L[0])]
+    start = min(range(len(pairs)), key=lambda k: (pairs[k][0].x, pairs[k][0].y))
+    pairs = pairs[start:] + pairs[:start]
+
+    edges = [h for _, h in pairs]
+    normals = np.array([math.atan2(h.b, h.a) for h in edges])
+    turns = (normals[0] - normals) % (2 * math.pi)
+    boxed = {id(h) for h in box}
+    return FeasibleRegion(status, [p for p, _ in pairs], edges, [id(h) in boxed for h in edges], turns)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+from src.geometry.primitives2d import Point2D
+from src.geometry.point_array import PointArray2D, unique_sorted_indices
+from src.geometry.predicates import ccw, dist2
+from src.geometry.instrument import phase
+from src.algorithms.hull2d_incremental import convex_hull_incremental
+import numpy as np
+
+
+def convex_hull_chan(points: list[Point2D] | PointArray2D) -> list[Point2D] | np.ndarray:
+    # Chan's output-sensitive hull, O(n log h)
+    if isinstance(points, PointArray2D):
+        # Array input: return hull vertices as indices into points
+        with phase("sort"):
+            order = unique_sorted_indices(points)
+        pts = points.take(order).to_points()
+        pos = {(p.x, p.y): k for k, p in enumerate(pts)}
+        hull = chan_sorted(pts)
+        return order[np.array([pos[(p.x, p.y)] for p in hull], dtype=np.intp)]
+
+    with phase("sort"):
+        pts_xy = sorted(set((p.x, p.y) for p in points))
+    return chan_sorted([Point2D(x, y) for x, y in pts_xy])
+
+
+def chan_sorted(pts: list[Point2D]) -> list[Point2D]:
+    # pts must be sorted by (x, y) without duplicates
+    n = len(pts)
+    if n <= 2:
+        return pts
+
+    # Guess h as m = 2^(2^t); a wrap of m steps that fails doubles t
+    t = 1
+    while True:
+        m = min(n, 2 ** (2 ** t))
+        hull = chan_wrap(pts, m)
+        if hull is not None:
+            return hull
+        t += 1
+
+
+def chan_wrap(pts: list[Point2D], m: int) -> list[Point2D] | None:
+    # Jarvis march over hulls of groups of m points; None if h > m
+    groups = [convex_hull_incremental(pts[i : i + m]) for i in range(0, len(pts), m)]
+
+    # pts is sorted, so pts[0] (leftmost) starts the first group's hull
+    start = (0, 0)
+    hull: list[Point2D] = []
+    cur = start
+    for _ in range(m):
+        g, i = cur
+        p = groups[g][i]
+        hull.append(p)
+
+        best = None
+        for h, H in enumerate(groups):
+            if h == g:
+                # Own hull: the next vertex clockwise
+                if len(H) == 1:
+                    continue
+                j = (i + 1) % len(H)
+            else:
+                j = tangent_index(p, H)
+            if best is None or beats(p, groups[best[0]][best[1]], H[j]):
+                best = (h, j)
+
+        cur = best
+        if cur == start:
+            return hull
+    return None
+
+
+def beats(p: Point2D, q: Point2D, r: Point2D) -> bool:
+    # Is r a better next hull point than q, seen from p?
+    turn = ccw(p, q, r)
+    return turn > 0 or (turn == 0 and dist2(p, r) > dist2(p, q))
+
+
+def tangent_index(p: Point2D, H: list[Point2D]) -> int:
+    # Vertex t of the clockwise hull H with every vertex right of (or on) p->t
+    n = len(H)
+    if n <= 3:
+        return linear_tangent(p, H)
+
+    # Binary search on the same hull in CCW order (V[k] = H[n-1-k])
+    def V(k: int) -> Point2D:
+        return H[n - 1 - (k % n)]
+
+    def above(a: Point2D, b: Point2D) -> bool:
+        return ccw(p, a, b) > 0
+
+    def below(a: Point2D, b: Point2D) -> bool:
+        return ccw(p, a, b) < 0
+
+    if above(V(n - 1), V(0)) and not below(V(1), V(0)):
+        return n - 1
+
+    a, b = 0, n
+    for _ in range(2 * n.bit_length() + 4):
+        c = (a + b) // 2
+        dn_c = below(V(c + 1), V(c))
+        if above(V(c - 1), V(c)) and not dn_c:
+            return n - 1 - (c % n)
+        if below(V(a + 1), V(a)):
+            if not dn_c or below(V(a), V(c)):
+                b = c
+            else:
+                a = c
+        else:
+            if dn_c or not above(V(a), V(c)):
+                a = c
+            else:
+                b = c
+
+    # Degenerate input (p collinear with an edge): fall back to a scan
+    return linear_tangent(p, H)
+
+
+def linear_tangent(p: Point2D, H: list[Point2D]) -> int:
+    best = 0
+    for j in range(1, len(H)):
+        if beats(p, H[best], H[j]):
+            best = j
+    return best
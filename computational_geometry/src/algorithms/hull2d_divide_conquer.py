@@ -1,12 +1,48 @@
 from __future__ import annotations
 from src.geometry.primitives2d import Point2D
-from src.geometry.predicates import ccw
-from src.algorithms.hull2d_incremental import convex_hull_incremental
+from src.geometry.point_array import PointArray2D, unique_sorted_indices
+from src.geometry.predicates import ccw, ccw_xy, dist2
+from src.geometry.instrument import phase, depth as record_depth
+from src.algorithms.hull2d_incremental import monotone_chain, monotone_chain_indices
+from src.algorithms.hull2d_prefilter import prefiltered
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+# Below this many distinct points the parallel mode runs serially:
+# starting workers and copying into shared memory would cost more
+SERIAL_CUTOFF = 100_000
+
+
+def convex_hull_dc(points: list[Point2D] | PointArray2D, prefilter: bool = False,
+                   workers: int = 1, serial_cutoff: int = SERIAL_CUTOFF) -> list[Point2D] | np.ndarray:
+    if prefilter:
+        return prefiltered(lambda P: convex_hull_dc(P, workers=workers, serial_cutoff=serial_cutoff), points)
+
+    if workers > 1:
+        # Parallel mode: top-level partitions go to worker processes
+        P = points if isinstance(points, PointArray2D) else PointArray2D.from_points(points)
+        with phase("sort"):
+            order = unique_sorted_indices(P)
+        if len(order) >= max(serial_cutoff, 2 * workers):
+            srt = P.take(order)
+            hull = build_hull_dc_parallel(srt.data, workers)
+            if isinstance(points, PointArray2D):
+                return order[np.asarray(hull, dtype=np.intp)]
+            return [srt[k] for k in hull]
+
+    if isinstance(points, PointArray2D):
+        # Array input: same recursion over point indices
+        with phase("sort"):
+            order = unique_sorted_indices(points).tolist()
+        if len(order) <= 1:
+            return np.asarray(order, dtype=np.intp)
+        hull = build_hull_dc_indices(points.x.tolist(), points.y.tolist(), order)
+        return np.asarray(hull, dtype=np.intp)
 
-
-def convex_hull_dc(points: list[Point2D]) -> list[Point2D]:
     # Remove duplicates and sort points by (x, y)
-    pts_xy = sorted(set((p.x, p.y) for p in points))
+    with phase("sort"):
+        pts_xy = sorted(set((p.x, p.y) for p in points))
     pts = [Point2D(x, y) for x, y in pts_xy]
     n = len(pts)
     if n <= 1:
@@ -15,97 +51,108 @@ def convex_hull_dc(points: list[Point2D]) -> list[Point2D]:
     return build_hull_dc(pts)
 
 
-def build_hull_dc(pts_sorted: list[Point2D]) -> list[Point2D]:
-    # Recursively build hull on sorted points
+def build_hull_dc(pts_sorted: list[Point2D], depth: int = 0) -> list[Point2D]:
+    # Recursively build hull on points already sorted by (x, y) without
+    # duplicates; nothing below this point sorts or dedupes again
+    record_depth("dc", depth)
     n = len(pts_sorted)
     if n <= 8:
-        # Small base case: use monotone chain (incremental) hull
-        return convex_hull_incremental(pts_sorted)
+        # Small base case: monotone chain on the sorted points
+        return monotone_chain(pts_sorted)
 
     mid = n // 2
-    left = build_hull_dc(pts_sorted[:mid])
-    right = build_hull_dc(pts_sorted[mid:])
+    left = build_hull_dc(pts_sorted[:mid], depth + 1)
+    right = build_hull_dc(pts_sorted[mid:], depth + 1)
 
-    return merge_hulls(left, right)  # Merge the two convex hulls
+    with phase("merge"):
+        return merge_hulls(left, right)  # Merge the two convex hulls
 
 
 def merge_hulls(L: list[Point2D], R: list[Point2D]) -> list[Point2D]:
+    # L and R are clockwise hulls starting at their leftmost point, with every
+    # point of L before every point of R in (x, y) order. The result has the
+    # same form, so it needs no rebuild.
     if len(L) == 0:
         return R
     if len(R) == 0:
         return L
-    if len(L) == 1 and len(R) == 1:
-        if L[0] == R[0]:
-            return [L[0]]
-        else:
-            return [L[0], R[0]]
-    if len(L) == 1:
-        return convex_hull_incremental(R + L)
-    if len(R) == 1:
-        return convex_hull_incremental(L + R)
 
     # Start from rightmost point of L and leftmost point of R
     i = idx_rightmost(L)
-    j = idx_leftmost(R)
+    j = 0
 
     # Find upper and lower tangents
-    i_upper, j_upper = upper_tangent(L, R, i, j)
-    i_lower, j_lower = lower_tangent(L, R, i, j)
+    jr = idx_rightmost(R)
+    i_upper, j_upper = upper_tangent(L, R, i, j, jr, ccw, dist2)
+    i_lower, j_lower = lower_tangent(L, R, i, j, jr, ccw, dist2)
 
-    merged: list[Point2D] = []
+    return join_at_tangents(L, R, i_upper, j_upper, i_lower, j_lower)
 
-    # Walk on L hull from upper tangent to lower tangent
-    idx = i_upper
-    merged.append(L[idx])
-    while idx != i_lower:
-        idx = next_idx(idx, len(L))
-        merged.append(L[idx])
 
-    # Walk on R hull from lower tangent to upper tangent
-    idx = j_lower
+def join_at_tangents(L: list, R: list, i_upper: int, j_upper: int, i_lower: int, j_lower: int) -> list:
+    # Upper chain of L up to the upper tangent, R clockwise between the
+    # tangents, then the lower chain of L back to its leftmost point
+    merged = L[: i_upper + 1]
+    idx = j_upper
     merged.append(R[idx])
-    while idx != j_upper:
+    while idx != j_lower:
         idx = next_idx(idx, len(R))
         merged.append(R[idx])
-
-    # Remove consecutive duplicates
-    cleaned: list[Point2D] = []
-    for p in merged:
-        if not cleaned or p != cleaned[-1]:
-            cleaned.append(p)
-
-    return convex_hull_incremental(cleaned)
+    if i_lower != 0:
+        merged.extend(L[i_lower:])
+    return merged
 
 
-def upper_tangent(L: list[Point2D], R: list[Point2D], i: int, j: int) -> tuple[int, int]:
-    # Move i and j until the upper tangent is found
+def upper_tangent(L: list, R: list, i: int, j: int, jr: int, turn=ccw, d2=dist2) -> tuple[int, int]:
+    # Move i back along L's upper chain and j forward along R's until no point
+    # is left of L[i] -> R[j]. Collinear points farther out are taken too, so
+    # the tangent skips vertices lying on it. Neither index leaves its chain
+    # (L[0]..L[i], R[0]..R[jr]), which keeps the walk finite even when
+    # rounding makes near-collinear hulls look slightly non-convex.
     changed = True
     while changed:
         changed = False
 
-        while ccw(R[j], L[i], L[next_idx(i, len(L))]) >= 0:
-            i = next_idx(i, len(L))
+        while i != 0:
+            k = prev_idx(i, len(L))
+            t = turn(L[i], R[j], L[k])
+            if not (t > 0 or (t == 0 and d2(R[j], L[k]) > d2(R[j], L[i]))):
+                break
+            i = k
             changed = True
 
-        while ccw(L[i], R[j], R[prev_idx(j, len(R))]) <= 0:
-            j = prev_idx(j, len(R))
+        while j != jr:
+            k = next_idx(j, len(R))
+            t = turn(L[i], R[j], R[k])
+            if not (t > 0 or (t == 0 and d2(L[i], R[k]) > d2(L[i], R[j]))):
+                break
+            j = k
             changed = True
 
     return i, j
 
 
-def lower_tangent(L: list[Point2D], R: list[Point2D], i: int, j: int) -> tuple[int, int]:
-    # Move i and j until the lower tangent is found
+def lower_tangent(L: list, R: list, i: int, j: int, jr: int, turn=ccw, d2=dist2) -> tuple[int, int]:
+    # Mirror of upper_tangent along the lower chains: no point may be right
+    # of L[i] -> R[j]
     changed = True
     while changed:
         changed = False
 
-        while ccw(R[j], L[i], L[prev_idx(i, len(L))]) <= 0:
-            i = prev_idx(i, len(L))
+        while i != 0:
+            k = next_idx(i, len(L))
+            t = turn(L[i], R[j], L[k])
+            if not (t < 0 or (t == 0 and d2(R[j], L[k]) > d2(R[j], L[i]))):
+                break
+            i = k
             changed = True
 
-        while ccw(L[i], R[j], R[next_idx(j, len(R))]) >= 0:
-            j = next_idx(j, len(R))
+        while j != jr:
+            k = prev_idx(j, len(R))
+            t = turn(L[i], R[j], R[k])
+            if not (t < 0 or (t == 0 and d2(L[i], R[k]) > d2(L[i], R[j]))):
+                break
+            j = k
             changed = True
 
     return i, j
@@ -136,4 +183,89 @@ def idx_leftmost(H: list[Point2D]) -> int:
     for idx, p in enumerate(H):
         if (p.x, p.y) < (H[best].x, H[best].y):
             best = idx
-    return best
\ No newline at end of file
+    return best
+
+
+# Index-based variants: hulls are lists of indices into xs/ys
+
+def build_hull_dc_indices(xs: list[float], ys: list[float], order: list[int], depth: int = 0) -> list[int]:
+    # Recursively build hull on indices sorted by (x, y)
+    record_depth("dc", depth)
+    n = len(order)
+    if n <= 8:
+        return monotone_chain_indices(xs, ys, order)
+
+    mid = n // 2
+    left = build_hull_dc_indices(xs, ys, order[:mid], depth + 1)
+    right = build_hull_dc_indices(xs, ys, order[mid:], depth + 1)
+
+    with phase("merge"):
+        return merge_hulls_indices(xs, ys, left, right)
+
+
+def merge_hulls_indices(xs: list[float], ys: list[float], L: list[int], R: list[int]) -> list[int]:
+    # merge_hulls over point indices
+    def cross(a: int, b: int, c: int) -> float:
+        return ccw_xy(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c])
+
+    def d2(a: int, b: int) -> float:
+        return (xs[a] - xs[b]) ** 2 + (ys[a] - ys[b]) ** 2
+
+    if len(L) == 0:
+        return R
+    if len(R) == 0:
+        return L
+
+    i = max(range(len(L)), key=lambda k: (xs[L[k]], ys[L[k]]))
+    jr = max(range(len(R)), key=lambda k: (xs[R[k]], ys[R[k]]))
+    iu, ju = upper_tangent(L, R, i, 0, jr, cross, d2)
+    il, jl = lower_tangent(L, R, i, 0, jr, cross, d2)
+    return join_at_tangents(L, R, iu, ju, il, jl)
+
+
+# Parallel mode: the sorted coordinates live in shared memory; workers get
+# (lo, hi) ranges and send back hull positions, never Point2D lists
+
+_worker_shm: SharedMemory | None = None
+_worker_xy: np.ndarray | None = None
+
+
+def _attach_points(name: str, m: int) -> None:
+    global _worker_shm, _worker_xy
+    _worker_shm = SharedMemory(name=name)
+    _worker_xy = np.ndarray((2, m), dtype=np.float64, buffer=_worker_shm.buf)
+
+
+def _hull_range(lo: int, hi: int) -> list[int]:
+    # Hull of sorted positions lo..hi-1
+    xs = _worker_xy[0, lo:hi].tolist()
+    ys = _worker_xy[1, lo:hi].tolist()
+    return [lo + k for k in build_hull_dc_indices(xs, ys, list(range(hi - lo)))]
+
+
+def build_hull_dc_parallel(xy: np.ndarray, workers: int) -> list[int]:
+    # Hull of (2, m) coordinates sorted by (x, y) without duplicates;
+    # returns positions into xy
+    m = xy.shape[1]
+    cuts = [m * w // workers for w in range(workers + 1)]
+
+    shm = SharedMemory(create=True, size=max(xy.nbytes, 1))
+    try:
+        buf = np.ndarray(xy.shape, dtype=np.float64, buffer=shm.buf)
+        buf[:] = xy
+        del buf
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_points, initargs=(shm.name, m)) as ex:
+            hulls = list(ex.map(_hull_range, cuts[:-1], cuts[1:]))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    # Merge neighbouring partial hulls pairwise in the parent
+    xs, ys = xy[0], xy[1]
+    with phase("merge"):
+        while len(hulls) > 1:
+            merged = [merge_hulls_indices(xs, ys, hulls[k], hulls[k + 1]) for k in range(0, len(hulls) - 1, 2)]
+            if len(hulls) % 2:
+                merged.append(hulls[-1])
+            hulls = merged
+    return hulls[0]
@@ -0,0 +1,26 @@
+from __future__ import annotations
+import os
+from typing import Callable
+import numpy as np
+from src.geometry.point_array import PointArray2D
+from src.geometry.point_file import CHUNK_SIZE, iter_chunks, open_points, read_header
+from src.algorithms.hull2d_incremental import convex_hull_incremental
+
+
+def convex_hull_file(path: str | os.PathLike, hull: Callable = convex_hull_incremental,
+                     chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    # Hull of a point file with one chunk in memory at a time: each chunk's
+    # hull is merged into the running hull by hulling their union. Same result
+    # as hull(PointArray2D) on the whole file: indices into the file, in the
+    # order of the in-memory algorithms. hull is any convex_hull_* function.
+    dim, _ = read_header(path)
+    if dim != 2:
+        raise ValueError("convex_hull_file expects a 2D point file")
+
+    mm = open_points(path)
+    running = np.empty(0, dtype=np.intp)
+    for lo, chunk in iter_chunks(path, chunk_size):
+        # Ascending indices, so duplicates resolve to their first occurrence
+        cand = np.sort(np.concatenate([running, lo + np.asarray(hull(chunk), dtype=np.intp)]))
+        running = cand[hull(PointArray2D(mm[cand].T))]
+    return running
@@ -1,12 +1,29 @@
 from __future__ import annotations
 from src.geometry.primitives2d import Point2D
-from src.geometry.predicates import ccw
+from src.geometry.point_array import PointArray2D, unique_sorted_indices
+from src.geometry.predicates import ccw, ccw_xy
+from src.geometry.instrument import phase
+from src.algorithms.hull2d_prefilter import prefiltered
+import numpy as np
 
-def convex_hull_incremental(points: list[Point2D]) -> list[Point2D]:
+def convex_hull_incremental(points: list[Point2D] | PointArray2D, prefilter: bool = False) -> list[Point2D] | np.ndarray:
         # Monotone chain convex hull
-        pts_xy = sorted(set((p.x, p.y) for p in points))
-        pts = [Point2D(x, y) for x, y in pts_xy]
+        if prefilter:
+            return prefiltered(convex_hull_incremental, points)
+        if isinstance(points, PointArray2D):
+            # Array input: return hull vertices as indices into points
+            with phase("sort"):
+                order = unique_sorted_indices(points).tolist()
+            hull = monotone_chain_indices(points.x.tolist(), points.y.tolist(), order)
+            return np.asarray(hull, dtype=np.intp)
 
+        with phase("sort"):
+            pts_xy = sorted(set((p.x, p.y) for p in points))
+        return monotone_chain([Point2D(x, y) for x, y in pts_xy])
+
+
+def monotone_chain(pts: list[Point2D]) -> list[Point2D]:
+        # pts must be sorted by (x, y) without duplicates
         n = len(pts)
         if n <= 1:
             return pts
@@ -34,3 +51,29 @@ def convex_hull_incremental(points: list[Point2D]) -> list[Point2D]:
         
         return upper + lower
 
+
+def monotone_chain_indices(xs: list[float], ys: list[float], order: list[int]) -> list[int]:
+    # Monotone chain over point indices; order must be sorted by (x, y) without duplicates
+    n = len(order)
+    if n <= 1:
+        return list(order)
+
+    def is_right_turn(a: int, b: int, c: int) -> bool:
+        return ccw_xy(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]) < 0
+
+    upper: list[int] = [order[0], order[1]]
+    for i in range(2, n):
+        upper.append(order[i])
+        while len(upper) >= 3 and (not is_right_turn(upper[-3], upper[-2], upper[-1])):
+            upper.pop(-2)
+
+    lower: list[int] = [order[n-1], order[n-2]]
+    for i in range(n-3, -1, -1):
+        lower.append(order[i])
+        while len(lower) >= 3 and (not is_right_turn(lower[-3], lower[-2], lower[-1])):
+            lower.pop(-2)
+
+    if len(lower) >= 2:
+        lower = lower[1:-1]
+
+    return upper + lower
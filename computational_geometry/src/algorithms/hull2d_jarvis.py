@@ -1,11 +1,21 @@
 from __future__ import annotations
 from src.geometry.primitives2d import Point2D
-from src.geometry.predicates import ccw, dist2
+from src.geometry.point_array import PointArray2D, unique_sorted_indices
+from src.geometry.predicates import ccw, dist2, ccw_batch, dist2_batch
+from src.geometry.instrument import phase
+from src.algorithms.hull2d_prefilter import prefiltered
+import numpy as np
 
 
-def convex_hull_jarvis(points: list[Point2D]) -> list[Point2D]:
+def convex_hull_jarvis(points: list[Point2D] | PointArray2D, prefilter: bool = False) -> list[Point2D] | np.ndarray:
+    if prefilter:
+        return prefiltered(convex_hull_jarvis, points)
+    if isinstance(points, PointArray2D):
+        return jarvis_indices(points)
+
     # Remove duplicates
-    pts_xy = sorted(set((p.x, p.y) for p in points))
+    with phase("sort"):
+        pts_xy = sorted(set((p.x, p.y) for p in points))
     pts = [Point2D(x, y) for x, y in pts_xy]
     n = len(pts)
     if n <= 1:
@@ -37,3 +47,45 @@ def convex_hull_jarvis(points: list[Point2D]) -> list[Point2D]:
             break
 
     return hull
+
+
+def jarvis_indices(points: PointArray2D) -> np.ndarray:
+    # Gift wrapping over an array; each wrap step is one tournament over all
+    # points (see wrap_step)
+    with phase("sort"):
+        order = unique_sorted_indices(points)
+    n = len(order)
+    if n <= 1:
+        return order
+
+    pts = points.take(order)
+    hull: list[int] = []
+    everyone = np.arange(n)
+
+    p = 0  # leftmost point comes first in sorted order
+    while True:
+        hull.append(p)
+        p = wrap_step(pts, p, everyone[everyone != p])
+        if p == 0:
+            break
+
+    return order[np.asarray(hull, dtype=np.intp)]
+
+
+def wrap_step(pts: PointArray2D, p: int, cand: np.ndarray) -> int:
+    # Most clockwise candidate seen from hull vertex p, farthest among
+    # collinear ones, by the list version's exact comparison. All candidates
+    # lie in a cone of angle below pi at p, so the comparison is a total
+    # order and pairwise knockout rounds find the winner with about n
+    # comparisons in total.
+    while len(cand) > 1:
+        rest = cand[len(cand) - len(cand) % 2:]
+        a, b = cand[0:len(cand) - 1:2], cand[1::2]
+        A, B = pts.take(a), pts.take(b)
+        turn = ccw_batch(pts[p], A, B)
+        win = turn > 0
+        tie = np.flatnonzero(turn == 0)
+        if len(tie):
+            win[tie] = dist2_batch(pts[p], B[tie]) > dist2_batch(pts[p], A[tie])
+        cand = np.concatenate([np.where(win, b, a), rest])
+    return int(cand[0])
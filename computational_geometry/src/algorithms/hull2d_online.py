@@ -0,0 +1,80 @@
+from __future__ import annotations
+from bisect import bisect_left
+from operator import attrgetter
+from typing import Iterable
+from src.geometry.primitives2d import Point2D
+from src.geometry.predicates import ccw
+
+_key = attrgetter("x", "y")
+
+
+class OnlineHull2D:
+    # Convex hull of a point stream. The upper and lower monotone chains are
+    # kept as lists sorted by (x, y), both running from the lowest leftmost to
+    # the highest rightmost point. A new point is located by binary search and
+    # either rejected or spliced in, cutting out the neighbours it makes
+    # non-convex; every point is cut at most once, so an update takes
+    # amortised O(log h) comparisons. A rejected point costs only those; an
+    # accepted one also pays one list insert and at most two slice deletes,
+    # O(h) element moves (fast memmoves in practice). Only hull vertices are
+    # stored.
+
+    def __init__(self, points: Iterable[Point2D] = ()) -> None:
+        self.upper: list[Point2D] = []
+        self.lower: list[Point2D] = []
+        self.extend(points)
+
+    def __len__(self) -> int:
+        # Number of hull vertices
+        n = len(self.upper) + len(self.lower)
+        return n - 2 if n > 2 else n // 2
+
+    def add(self, p: Point2D) -> None:
+        self._insert(self.upper, p, 1)
+        self._insert(self.lower, p, -1)
+
+    def extend(self, points: Iterable[Point2D]) -> None:
+        # Points are consumed one at a time, so any iterator works
+        for p in points:
+            self.add(p)
+
+    @staticmethod
+    def _insert(chain: list[Point2D], p: Point2D, side: int) -> None:
+        # side = 1 for the upper chain (right turns), -1 for the lower one
+        pos = bisect_left(chain, _key(p), key=_key)
+        if pos < len(chain) and chain[pos] == p:
+            return
+        if 0 < pos < len(chain) and side * ccw(chain[pos - 1], chain[pos], p) <= 0:
+            return   # on or inside the chain
+
+        chain.insert(pos, p)
+        # Cut out the neighbours that no longer turn the right way, each run
+        # in one slice delete
+        j = pos + 1
+        while j + 1 < len(chain) and side * ccw(p, chain[j], chain[j + 1]) >= 0:
+            j += 1
+        del chain[pos + 1:j]
+        i = pos - 1
+        while i >= 1 and side * ccw(chain[i - 1], chain[i], p) >= 0:
+            i -= 1
+        del chain[i + 1:pos]
+
+    def contains(self, p: Point2D) -> bool:
+        # Is p inside the hull or on its boundary? O(log h)
+        if not self.upper:
+            return False
+        return self._below(self.upper, p, 1) and self._below(self.lower, p, -1)
+
+    @staticmethod
+    def _below(chain: list[Point2D], p: Point2D, side: int) -> bool:
+        # On the inner side of (or on) the chain, for side as in _insert
+        pos = bisect_left(chain, _key(p), key=_key)
+        if pos == len(chain):
+            return False
+        if pos == 0:
+            return chain[0] == p
+        return side * ccw(chain[pos - 1], chain[pos], p) <= 0
+
+    def hull(self) -> list[Point2D]:
+        # Snapshot in the order of the batch hulls: clockwise from the leftmost point
+        return self.upper + self.lower[-2:0:-1]
@@ -0,0 +1,59 @@
+from __future__ import annotations
+from typing import Callable
+from src.geometry.primitives2d import Point2D
+from src.geometry.point_array import PointArray2D
+from src.geometry.predicates import ccw_batch
+from src.geometry.instrument import count
+import numpy as np
+
+
+def interior_mask(P: PointArray2D) -> np.ndarray:
+    # Points strictly inside the octagon of the 8 extreme points
+    # (min/max of x, y, x+y, x-y); those can never be hull vertices
+    inside = np.zeros(len(P), dtype=bool)
+    if len(P) < 3:
+        return inside
+
+    x, y = P.x, P.y
+    s, d = x + y, x - y
+    # Extremes in CCW order around the hull: directions 180, 225, ..., 135 degrees
+    picks = [np.argmin(x), np.argmin(s), np.argmin(y), np.argmax(d),
+             np.argmax(x), np.argmax(s), np.argmax(y), np.argmin(d)]
+
+    octagon: list[Point2D] = []
+    for i in picks:
+        p = P[int(i)]
+        if not octagon or (p != octagon[-1] and p != octagon[0]):
+            octagon.append(p)
+    if len(octagon) < 3:
+        return inside
+
+    inside[:] = True
+    for a, b in zip(octagon, octagon[1:] + octagon[:1]):
+        inside &= ccw_batch(a, b, P) > 0
+    return inside
+
+
+def akl_toussaint(points: list[Point2D] | PointArray2D) -> tuple[list[Point2D] | np.ndarray, int]:
+    # Akl-Toussaint heuristic: one linear pass that drops interior points.
+    # Returns (kept points, number removed); kept are indices for PointArray2D input.
+    if isinstance(points, PointArray2D):
+        keep = np.flatnonzero(~interior_mask(points))
+        return keep, len(points) - len(keep)
+
+    pts = list(points)
+    if len(pts) < 3:
+        return pts, 0
+    inside = interior_mask(PointArray2D.from_points(pts)).tolist()
+    kept = [p for p, out in zip(pts, inside) if not out]
+    return kept, len(pts) - len(kept)
+
+
+def prefiltered(hull: Callable, points: list[Point2D] | PointArray2D) -> list[Point2D] | np.ndarray:
+    # Run a 2D hull algorithm on the points that survive the prefilter; the
+    # number removed is counted as "prefilter.removed" under instrument()
+    kept, removed = akl_toussaint(points)
+    count("prefilter.removed", removed)
+    if isinstance(points, PointArray2D):
+        return kept[hull(points.take(kept))]
+    return hull(kept)
@@ -1,6 +1,10 @@
 from __future__ import annotations
 from src.geometry.primitives2d import Point2D
-from src.geometry.predicates import ccw
+from src.geometry.point_array import PointArray2D, unique_sorted_indices
+from src.geometry.predicates import CCW_ERR, ccw_batch, ccw_cmp
+from src.geometry.instrument import phase, depth as record_depth
+from src.algorithms.hull2d_prefilter import prefiltered
+import numpy as np
 
 
 def extreme_points(points: list[Point2D]) -> tuple[Point2D, Point2D]:
@@ -20,11 +24,12 @@ def split_by_line(A: Point2D, B: Point2D, points: list[Point2D]) -> tuple[list[P
     above: list[Point2D] = []
     below: list[Point2D] = []
     collinear: list[Point2D] = []
+    if len(points) == 0:
+        return above, below, collinear
 
-    for p in points:
+    for p, s in zip(points, ccw_batch(A, B, points).tolist()):
         if p == A or p == B:
             continue
-        s = ccw(A, B, p)
         if s > 0:
             above.append(p)
         elif s < 0:
@@ -35,31 +40,57 @@ def split_by_line(A: Point2D, B: Point2D, points: list[Point2D]) -> tuple[list[P
     return above, below, collinear
 
 
+def farthest(A: Point2D, B: Point2D, xs: np.ndarray, ys: np.ndarray, vals: np.ndarray) -> int:
+    # Position of the point farthest left of A->B, given vals = ccw(A, B, p).
+    # Each val is off by at most err, so only points within 2*err of the
+    # largest can be the farthest; those are compared exactly (first wins ties)
+    i = int(np.argmax(vals))
+    err = CCW_ERR * (abs(B.x - A.x) * float(np.max(np.abs(ys - A.y))) + abs(B.y - A.y) * float(np.max(np.abs(xs - A.x))))
+    near = np.flatnonzero(vals >= vals[i] - 3 * err)
+    if len(near) == 1:
+        return i
+    best = int(near[0])
+    for k in near[1:].tolist():
+        if ccw_cmp(A, B, Point2D(float(xs[k]), float(ys[k])), Point2D(float(xs[best]), float(ys[best]))) > 0:
+            best = k
+    return best
+
+
 def farthest_point_from_line(A: Point2D, B: Point2D, pts: list[Point2D]) -> Point2D:
-    # Max distance from line AB
-    return max(pts, key=lambda p: abs(ccw(A, B, p)))
+    # Max distance from line AB, for points to the left of it
+    P = PointArray2D.from_points(pts)
+    return pts[farthest(A, B, P.x, P.y, ccw_batch(A, B, P))]
 
 
 def points_left_of_line(A: Point2D, B: Point2D, pts: list[Point2D]) -> list[Point2D]:
     # Points strictly to the left of directed line A->B
-    return [p for p in pts if ccw(A, B, p) > 0]
+    if len(pts) == 0:
+        return []
+    return [p for p, s in zip(pts, ccw_batch(A, B, pts).tolist()) if s > 0]
 
 
-def quickhull_side(A: Point2D, B: Point2D, S: list[Point2D]) -> list[Point2D]:
+def quickhull_side(A: Point2D, B: Point2D, S: list[Point2D], depth: int = 0) -> list[Point2D]:
     # Recursive QuickHull on one side of line AB
     if len(S) == 0:
         return []
+    record_depth("quickhull", depth)
 
     C = farthest_point_from_line(A, B, S)
     S1 = points_left_of_line(A, C, S)
     S2 = points_left_of_line(C, B, S)
 
-    return quickhull_side(A, C, S1) + [C] + quickhull_side(C, B, S2)
+    return quickhull_side(A, C, S1, depth + 1) + [C] + quickhull_side(C, B, S2, depth + 1)
 
 
-def convex_hull_quickhull(points: list[Point2D]) -> list[Point2D]:
+def convex_hull_quickhull(points: list[Point2D] | PointArray2D, prefilter: bool = False) -> list[Point2D] | np.ndarray:
     # QuickHull convex hull
-    pts_xy = sorted(set((p.x, p.y) for p in points))
+    if prefilter:
+        return prefiltered(convex_hull_quickhull, points)
+    if isinstance(points, PointArray2D):
+        return quickhull_indices(points)
+
+    with phase("sort"):
+        pts_xy = sorted(set((p.x, p.y) for p in points))
     pts = [Point2D(x, y) for x, y in pts_xy]
     if len(pts) <= 1:
         return pts
@@ -70,4 +101,31 @@ def convex_hull_quickhull(points: list[Point2D]) -> list[Point2D]:
     upper = quickhull_side(A, B, above)
     lower = quickhull_side(B, A, below)
 
-    return [A] + upper + [B] + lower
\ No newline at end of file
+    return [A] + upper + [B] + lower
+
+
+def quickhull_indices(points: PointArray2D) -> np.ndarray:
+    # QuickHull over an array; returns indices into points
+    with phase("sort"):
+        order = unique_sorted_indices(points)
+    if len(order) <= 1:
+        return order
+
+    def side(a: int, b: int, S: np.ndarray) -> np.ndarray:
+        return ccw_batch(points[a], points[b], points.take(S))
+
+    def rec(a: int, b: int, S: np.ndarray, depth: int = 0) -> list[int]:
+        if len(S) == 0:
+            return []
+        record_depth("quickhull", depth)
+        c = int(S[farthest(points[a], points[b], points.x[S], points.y[S], side(a, b, S))])
+        S1 = S[side(a, c, S) > 0]
+        S2 = S[side(c, b, S) > 0]
+        return rec(a, c, S1, depth + 1) + [c] + rec(c, b, S2, depth + 1)
+
+    A, B = int(order[0]), int(order[-1])
+    rest = order[1:-1]
+    s = side(A, B, rest)
+
+    hull = [A] + rec(A, B, rest[s > 0]) + [B] + rec(B, A, rest[s < 0])
+    return np.asarray(hull, dtype=np.intp)
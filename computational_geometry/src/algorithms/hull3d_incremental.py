@@ -1,108 +1,172 @@
 from __future__ import annotations
+import random
+import time
+from typing import Optional
 from src.geometry.primitives3d import Point3D
-from src.geometry.predicates import orient3d
+from src.geometry.point_array import PointArray2D, PointArray3D, unique_sorted_indices
+from src.geometry.predicates import ccw_batch, orient3d_batch
+from src.geometry.instrument import active, add_time, phase
+import numpy as np
 
-EPS = 1e-9
 Face = tuple[int, int, int]
 
 
-def initial_tetra(pts: list[Point3D]) -> tuple[int, int, int, int]:
+def off_line(P: PointArray3D, a: int, b: int) -> np.ndarray:
+    # Exact mask of the points off the line P[a]P[b]: collinear in 3D iff
+    # collinear in all three coordinate planes
+    off = np.zeros(len(P), dtype=bool)
+    for i, j in ((0, 1), (1, 2), (2, 0)):
+        Q = PointArray2D(P.data[[i, j]])
+        off |= ccw_batch(Q[a], Q[b], Q) != 0
+    return off
+
+
+def initial_tetra(pts: list[Point3D] | PointArray3D) -> tuple[int, int, int, int]:
     # Pick 4 non-coplanar points to form an initial tetrahedron
     n = len(pts)
     if n < 4:
         raise ValueError("Need at least 4 points")
 
-    a = min(range(n), key=lambda i: (pts[i].x, pts[i].y, pts[i].z))
-    b = max(range(n), key=lambda i: (pts[i].x, pts[i].y, pts[i].z))
-    if a == b:
+    P = pts if isinstance(pts, PointArray3D) else PointArray3D.from_points(pts)
+    order = np.lexsort(P.data[::-1])
+    a, b = int(order[0]), int(order[-1])
+    if a == b or np.array_equal(P.data[:, a], P.data[:, b]):
         raise ValueError("All points identical")
 
-    p0, p1 = pts[a], pts[b]
-
-    def line_score(i: int) -> float:
-        # Squared distance from point i to line (p0,p1)
-        ux, uy, uz = p1.x - p0.x, p1.y - p0.y, p1.z - p0.z
-        vx, vy, vz = pts[i].x - p0.x, pts[i].y - p0.y, pts[i].z - p0.z
-        cx, cy, cz = uy * vz - uz * vy, uz * vx - ux * vz, ux * vy - uy * vx
-        return cx * cx + cy * cy + cz * cz
-
-    c = max((i for i in range(n) if i not in (a, b)), key=line_score)
-    if line_score(c) < EPS:
+    # Squared distance from each point to line (p0,p1)
+    u = P.data[:, b] - P.data[:, a]
+    v = P.data - P.data[:, [a]]
+    line_score = np.sum(np.cross(u, v, axis=0) ** 2, axis=0)
+    line_score[~off_line(P, a, b)] = -1.0
+    c = int(np.argmax(line_score))
+    if line_score[c] < 0:
         raise ValueError("All points collinear")
 
-    def plane_score(i: int) -> float:
-        # Plane score
-        return abs(orient3d(pts[a], pts[b], pts[c], pts[i]))
-
-    d = max((i for i in range(n) if i not in (a, b, c)), key=plane_score)
-    if plane_score(d) < EPS:
+    plane_score = np.abs(orient3d_batch(P[a], P[b], P[c], P))
+    plane_score[[a, b, c]] = -1.0
+    d = int(np.argmax(plane_score))
+    if plane_score[d] <= 0:
         raise ValueError("All points coplanar")
 
     return a, b, c, d
 
 
-def convex_hull_3d_incremental(points: list[Point3D]) -> tuple[list[Point3D], list[Face]]:
-    # Incremental 3D convex hull (returns vertices and triangular faces)
-    uniq = sorted(set((p.x, p.y, p.z) for p in points))
+def convex_hull_3d_incremental(points: list[Point3D] | PointArray3D, seed: Optional[int] = 0) -> tuple[list[Point3D], list[Face]] | tuple[PointArray3D, np.ndarray]:
+    # Randomized incremental 3D convex hull (returns vertices and triangular faces)
+    if isinstance(points, PointArray3D):
+        # Array input: faces come back as an (m, 3) index array into points
+        with phase("sort"):
+            order = unique_sorted_indices(points)
+        if len(order) < 4:
+            raise ValueError("Need at least 4 unique points")
+        faces = hull3d_faces(points.take(order), seed)
+        return points, order[np.asarray(faces, dtype=np.intp).reshape(-1, 3)]
+
+    with phase("sort"):
+        uniq = sorted(set((p.x, p.y, p.z) for p in points))
     pts = [Point3D(x, y, z) for x, y, z in uniq]
     if len(pts) < 4:
         raise ValueError("Need at least 4 unique points")
 
-    a, b, c, d = initial_tetra(pts)
-
-    inside = Point3D(
-        (pts[a].x + pts[b].x + pts[c].x + pts[d].x) / 4.0,
-        (pts[a].y + pts[b].y + pts[c].y + pts[d].y) / 4.0,
-        (pts[a].z + pts[b].z + pts[c].z + pts[d].z) / 4.0,
-    )
-
-    # Make face orientation consistent
-    def fix(face: Face) -> Face:
-        i, j, k = face
-        return (i, k, j) if orient3d(pts[i], pts[j], pts[k], inside) > 0 else face
-
-    def is_visible(face: Face, p: Point3D) -> bool:
-        i, j, k = face
-        return orient3d(pts[i], pts[j], pts[k], p) > EPS
-
-    # Initial tetra faces
-    faces: list[Face] = [(a, b, c), (a, d, b), (a, c, d), (b, d, c),]
-    faces = [fix(f) for f in faces]
-
-    seed = {a, b, c, d}
-
-    for pid, p in enumerate(pts):
-        if pid in seed:
-            continue
-        
-        # Find faces visible from p
-        visible_faces = [f for f in faces if is_visible(f, p)]
-        if not visible_faces:
-            continue
-
-        # Count edges of visible faces to find the horizon
-        edge_count: dict[tuple[int, int], int] = {}
-        edge_dir: dict[tuple[int, int], tuple[int, int]] = {}
-
-        def add_edge(u: int, v: int) -> None:
-            key = (u, v) if u < v else (v, u)
-            edge_count[key] = edge_count.get(key, 0) + 1
-            edge_dir[key] = (u, v)
-
-        for i, j, k in visible_faces:
-            add_edge(i, j)
-            add_edge(j, k)
-            add_edge(k, i)
-
-        # Remove visible faces
-        vis_set = set(visible_faces)
-        faces = [f for f in faces if f not in vis_set]
-
-        # Horizon edges appear exactly once
-        for key, cnt in edge_count.items():
-            if cnt == 1:
-                u, v = edge_dir[key]
-                faces.append(fix((u, v, pid)))
-
-    return pts, faces
-
+    return pts, hull3d_faces(PointArray3D.from_xyz(*zip(*uniq)), seed)
+
+
+def hull3d_faces(P: PointArray3D, seed: Optional[int] = 0) -> list[Face]:
+    # Clarkson-Shor: points are inserted in random order while a conflict graph
+    # records which unprocessed points see which faces
+    with phase("seed"):
+        a, b, c, d = initial_tetra(P)
+
+    # Faces by id; half-edge h = 3*f + e runs from verts[f][e] to verts[f][(e+1)%3]
+    verts: list[Face] = []
+    alive: list[bool] = []
+    twin: list[int] = []
+    conf_f: list[np.ndarray] = []     # face -> unprocessed points that see it
+    conf_p: list[set[int]] = [set() for _ in range(len(P))]   # point -> faces it sees
+
+    def add_face(i: int, j: int, k: int, cand: np.ndarray) -> int:
+        f = len(verts)
+        verts.append((i, j, k))
+        alive.append(True)
+        twin.extend((-1, -1, -1))
+        if len(cand):
+            cand = cand[orient3d_batch(P[i], P[j], P[k], P.take(cand)) > 0]
+        conf_f.append(cand)
+        for q in cand.tolist():
+            conf_p[q].add(f)
+        return f
+
+    def link(h: int, t: int) -> None:
+        twin[h] = t
+        twin[t] = h
+
+    # Initial tetra, each face oriented with the opposite vertex (and so the
+    # interior) on its negative side; exact, unlike testing the centroid
+    rest = np.array([i for i in range(len(P)) if i not in (a, b, c, d)], dtype=np.intp)
+    for i, j, k, o in [(a, b, c, d), (a, d, b, c), (a, c, d, b), (b, d, c, a)]:
+        if orient3d_batch(P[i], P[j], P[k], P[o]) > 0:
+            j, k = k, j
+        add_face(i, j, k, rest)
+
+    # Glue the tetra's half-edges together by their endpoints
+    by_edge: dict[tuple[int, int], int] = {}
+    for f in range(4):
+        for e in range(3):
+            by_edge[(verts[f][e], verts[f][(e + 1) % 3])] = 3 * f + e
+    for (u, v), h in by_edge.items():
+        twin[h] = by_edge[(v, u)]
+
+    order = rest.tolist()
+    random.Random(seed).shuffle(order)
+
+    timed = active() is not None
+    for pid in order:
+        visible = conf_p[pid]
+        if not visible:
+            continue    # inside the current hull
+        if timed:
+            t0 = time.perf_counter()
+
+        # Walk the visible region; the horizon is where it meets hidden faces
+        horizon: list[int] = []
+        start = next(iter(visible))
+        stack = [start]
+        seen = {start}
+        while stack:
+            f = stack.pop()
+            for h in range(3 * f, 3 * f + 3):
+                g = twin[h] // 3
+                if g in visible:
+                    if g not in seen:
+                        seen.add(g)
+                        stack.append(g)
+                else:
+                    horizon.append(h)
+        if timed:
+            t1 = time.perf_counter()
+            add_time("visibility", t1 - t0)
+
+        # One new face per horizon edge, apex pid; conflicts come from the two old faces
+        by_start: dict[int, int] = {}
+        for h in horizon:
+            f, e = divmod(h, 3)
+            u, v = verts[f][e], verts[f][(e + 1) % 3]
+            t = twin[h]
+            cand = np.union1d(conf_f[f], conf_f[t // 3])
+            nf = add_face(u, v, pid, cand[cand != pid])
+            link(3 * nf, t)
+            by_start[u] = nf
+
+        for nf in by_start.values():
+            link(3 * nf + 1, 3 * by_start[verts[nf][1]] + 2)
+
+        # Drop the visible faces and their conflict edges
+        for f in list(visible):
+            alive[f] = False
+            for q in conf_f[f].tolist():
+                conf_p[q].discard(f)
+            conf_f[f] = conf_f[f][:0]
+        if timed:
+            add_time("horizon", time.perf_counter() - t1)
+
+    return [verts[f] for f in range(len(verts)) if alive[f]]
@@ -2,6 +2,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional
 from src.geometry.primitives2d import Point2D
+from src.geometry.point_array import PointArray2D
+import numpy as np
 
 @dataclass(slots=True)
 class KDNode:
@@ -9,8 +11,29 @@ class KDNode:
     axis: int          # 0: split x, 1: split y
     left: Optional["KDNode"] = None
     right: Optional["KDNode"] = None
+    idx: int = -1      # index into the source PointArray2D, -1 for list input
+    size: int = 1      # number of points in this subtree
+    box: Optional[tuple[float, float, float, float]] = None   # subtree (xmin, xmax, ymin, ymax)
+
+def augment(node: KDNode) -> KDNode:
+    # Subtree size and bounding box from the (already augmented) children
+    x0 = x1 = node.p.x
+    y0 = y1 = node.p.y
+    size = 1
+    for child in (node.left, node.right):
+        if child is not None:
+            size += child.size
+            cx0, cx1, cy0, cy1 = child.box
+            x0, x1 = min(x0, cx0), max(x1, cx1)
+            y0, y1 = min(y0, cy0), max(y1, cy1)
+    node.size = size
+    node.box = (x0, x1, y0, y1)
+    return node
+
+def build_kdtree(points: list[Point2D] | PointArray2D, depth: int = 0) -> Optional[KDNode]:
+    if isinstance(points, PointArray2D):
+        return build_kdtree_indices(points, np.arange(len(points)), depth)
 
-def build_kdtree(points: list[Point2D], depth: int = 0) -> Optional[KDNode]:
     if not points:
         return None
 
@@ -27,4 +50,130 @@ def build_kdtree(points: list[Point2D], depth: int = 0) -> Optional[KDNode]:
     # Build subtrees from points left/right of the median
     node.left = build_kdtree(pts[:mid], depth + 1)
     node.right = build_kdtree(pts[mid + 1 :], depth + 1)
-    return node
+    return augment(node)
+
+
+def build_kdtree_indices(points: PointArray2D, idx: np.ndarray, depth: int = 0) -> Optional[KDNode]:
+    # Same splits as build_kdtree, over a subset of array indices
+    if len(idx) == 0:
+        return None
+
+    axis = depth % 2
+    xs, ys = points.x[idx], points.y[idx]
+    perm = np.lexsort((ys, xs)) if axis == 0 else np.lexsort((xs, ys))
+    idx = idx[perm]
+    mid = len(idx) // 2
+
+    i = int(idx[mid])
+    node = KDNode(points[i], axis, idx=i)
+    node.left = build_kdtree_indices(points, idx[:mid], depth + 1)
+    node.right = build_kdtree_indices(points, idx[mid + 1 :], depth + 1)
+    return augment(node)
+
+
+@dataclass(slots=True)
+class FlatKDTree:
+    # Implicit left-balanced kd-tree: node k has children 2k+1 and 2k+2,
+    # and nodes 0..n-1 are all present (complete binary tree)
+    points: PointArray2D
+    idx: np.ndarray      # node -> index of its point in points
+    axis: np.ndarray     # node -> 0: split x, 1: split y
+    split: np.ndarray    # node -> coordinate of the split along axis
+    box: np.ndarray      # (4, n): subtree xmin, xmax, ymin, ymax per node
+    size: np.ndarray     # node -> number of points in its subtree
+
+    def __len__(self) -> int:
+        return len(self.idx)
+
+    def subtree(self, k: int) -> np.ndarray:
+        # Point indices of the subtree under node k (level d is one contiguous run)
+        n = len(self.idx)
+        runs: list[np.ndarray] = []
+        lo, width = k, 1
+        while lo < n:
+            runs.append(self.idx[lo : min(lo + width, n)])
+            lo, width = 2 * lo + 1, 2 * width
+        return np.concatenate(runs)
+
+
+def left_subtree_sizes(m: np.ndarray) -> np.ndarray:
+    # Size of the left subtree of a complete binary tree with m nodes
+    _, e = np.frexp(m + 1)
+    h = e.astype(np.int64) - 1                  # number of full levels
+    half = np.where(h > 0, 1 << np.maximum(h - 1, 0), 0)
+    last = m + 1 - (1 << h)                     # nodes on the partial last level
+    return np.where(h > 0, half - 1 + np.minimum(last, half), 0)
+
+
+def build_flat_kdtree(points: list[Point2D] | PointArray2D) -> FlatKDTree:
+    # O(n log n) build: presort by (x, y) and (y, x) once, then split every
+    # node of a level at once and stable-partition the other order in O(n)
+    P = points if isinstance(points, PointArray2D) else PointArray2D.from_points(points)
+    n = len(P)
+    idx = np.empty(n, dtype=np.intp)
+    axis = np.empty(n, dtype=np.int8)
+    split = np.empty(n, dtype=np.float64)
+
+    orders = [np.lexsort((P.y, P.x)), np.lexsort((P.x, P.y))]
+    starts = np.zeros(1 if n else 0, dtype=np.intp)
+    sizes = np.full(len(starts), n, dtype=np.intp)
+    first = 0   # id of the first node on the current level
+    depth = 0
+    side = np.empty(n, dtype=np.int8)
+
+    while len(sizes):
+        a = depth % 2
+        oa, ob = orders[a], orders[1 - a]
+        L = left_subtree_sizes(sizes)
+        R = sizes - 1 - L
+        seg = np.repeat(np.arange(len(sizes)), sizes)
+
+        # Medians of every segment along this level's axis
+        med_pos = starts + L
+        nodes = first + np.arange(len(sizes))
+        med = oa[med_pos]
+        idx[nodes] = med
+        axis[nodes] = a
+        split[nodes] = P.data[a, med]
+
+        # -1 left of the median, 0 median, +1 right (by point id)
+        side_a = np.sign(np.arange(len(oa)) - med_pos[seg]).astype(np.int8)
+        side[oa] = side_a
+
+        child_sizes = np.column_stack([L, R]).ravel()
+        child_starts = np.concatenate([[0], np.cumsum(child_sizes)[:-1]]).astype(np.intp)
+
+        # Stable partition of the other order inside each segment
+        sb = side[ob]
+        is_l, is_r = sb < 0, sb > 0
+        cl, cr = np.cumsum(is_l), np.cumsum(is_r)
+        rank_l = cl - 1 - (cl[starts] - is_l[starts])[seg]
+        rank_r = cr - 1 - (cr[starts] - is_r[starts])[seg]
+        new_pos = np.where(is_l, child_starts[0::2][seg] + rank_l, child_starts[1::2][seg] + rank_r)
+        keep = sb != 0
+        new_ob = np.empty(len(oa) - len(sizes), dtype=np.intp)
+        new_ob[new_pos[keep]] = ob[keep]
+
+        orders[a] = oa[side_a != 0]
+        orders[1 - a] = new_ob
+
+        # Empty children only occur at the end of a level in a complete tree
+        nonempty = child_sizes > 0
+        starts = child_starts[nonempty]
+        sizes = child_sizes[nonempty]
+        first = 2 * first + 1
+        depth += 1
+
+    # Bottom-up subtree boxes and sizes, one level at a time
+    box = np.vstack([P.x[idx], P.x[idx], P.y[idx], P.y[idx]])
+    size = np.ones(n, dtype=np.intp)
+    lo = first
+    while lo > 0:
+        nodes = np.arange(lo, min(2 * lo + 1, n))
+        parents = (nodes - 1) // 2
+        np.add.at(size, parents, size[nodes])
+        for row, op in ((0, np.minimum), (1, np.maximum), (2, np.minimum), (3, np.maximum)):
+            op.at(box[row], parents, box[row, nodes])
+        lo = (lo - 1) // 2
+
+    return FlatKDTree(P, idx, axis, split, box, size)
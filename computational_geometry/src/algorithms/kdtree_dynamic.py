@@ -0,0 +1,134 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterable, Optional
+import numpy as np
+from src.geometry.primitives2d import Point2D
+from src.algorithms.kdtree import FlatKDTree, build_flat_kdtree
+
+# Deleted points stay in their tree (tombstones) until the tree is rebuilt
+# once more than this fraction of it is dead
+DEAD_FRACTION = 0.5
+# New points wait in a plain list that queries scan; building tiny trees
+# costs more than scanning them
+BUFFER_SIZE = 64
+
+
+@dataclass(slots=True)
+class Bucket:
+    tree: FlatKDTree
+    pts: list[Point2D]   # tree.points as Point2D, for reporting
+    alive: np.ndarray    # point index -> still present
+    dead: int = 0
+
+
+class DynamicKDTree:
+    # Logarithmic method: a forest of static flat kd-trees where level j holds
+    # at most BUFFER_SIZE * 2^j points. Inserts fill a small buffer, then merge
+    # the full low levels like a binary counter (amortised O(log^2 n)); deletes
+    # are lazy and trigger a partial rebuild of one tree when it becomes mostly dead.
+
+    def __init__(self, points: Iterable[Point2D] = ()) -> None:
+        self.buffer: list[Point2D] = []
+        self.levels: list[Optional[Bucket]] = []
+        self.where: dict[tuple[float, float], list[tuple[int, int]]] = {}
+        self.size = 0
+        self._load(list(points))
+
+    def _load(self, pts: list[Point2D]) -> None:
+        # Everything in one tree at the smallest level that fits
+        if pts:
+            j = max(0, (-(-len(pts) // BUFFER_SIZE) - 1).bit_length())
+            self._place(j, pts)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def buckets(self) -> list[Bucket]:
+        return [b for b in self.levels if b is not None]
+
+    def points(self) -> list[Point2D]:
+        # Live points
+        out: list[Point2D] = list(self.buffer)
+        for b in self.buckets():
+            out.extend(b.pts[i] for i in np.flatnonzero(b.alive).tolist())
+        return out
+
+    def _live(self, j: int) -> list[Point2D]:
+        # Live points of level j, dropped from the location index
+        b = self.levels[j]
+        if b is None:
+            return []
+        live: list[Point2D] = []
+        for i in np.flatnonzero(b.alive).tolist():
+            self._forget(b.pts[i], j, i)
+            live.append(b.pts[i])
+        return live
+
+    def _forget(self, p: Point2D, j: int, i: int) -> None:
+        locs = self.where[(p.x, p.y)]
+        locs.remove((j, i))
+        if not locs:
+            del self.where[(p.x, p.y)]
+
+    def _place(self, j: int, pts: list[Point2D]) -> None:
+        # Build level j from pts and index where each point went
+        while len(self.levels) <= j:
+            self.levels.append(None)
+        if not pts:
+            self.levels[j] = None
+            return
+        tree = build_flat_kdtree(pts)
+        self.levels[j] = Bucket(tree, pts, np.ones(len(pts), dtype=bool))
+        for i, p in enumerate(pts):
+            self.where.setdefault((p.x, p.y), []).append((j, i))
+        self.size += len(pts)
+
+    def insert(self, p: Point2D) -> None:
+        self.size += 1
+        self.buffer.append(p)
+        if len(self.buffer) < BUFFER_SIZE:
+            return
+
+        carry = self.buffer
+        self.buffer = []
+        self.size -= len(carry)
+        j = 0
+        while j < len(self.levels) and self.levels[j] is not None:
+            live = self._live(j)
+            self.size -= len(live)
+            carry.extend(live)
+            self.levels[j] = None
+            j += 1
+        self._place(j, carry)
+
+    def delete(self, p: Point2D) -> bool:
+        # Remove one copy of p; False if it is not present
+        if p in self.buffer:
+            self.buffer.remove(p)
+            self.size -= 1
+            return True
+        locs = self.where.get((p.x, p.y))
+        if not locs:
+            return False
+        j, i = locs[-1]
+        self._forget(p, j, i)
+        b = self.levels[j]
+        b.alive[i] = False
+        b.dead += 1
+        self.size -= 1
+
+        # Partial rebuild of a mostly dead tree
+        if b.dead > DEAD_FRACTION * len(b.alive):
+            live = self._live(j)
+            self.size -= len(live)
+            self._place(j, live)
+        return True
+
+    def rebuild(self) -> None:
+        # Collapse everything into one freshly built tree
+        pts = self.points()
+        self.buffer = []
+        self.levels = []
+        self.where = {}
+        self.size = 0
+        self._load(pts)
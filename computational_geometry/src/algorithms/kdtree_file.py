@@ -0,0 +1,167 @@
+from __future__ import annotations
+import os
+import tempfile
+from dataclasses import dataclass
+import numpy as np
+from src.geometry.point_file import CHUNK_SIZE, create_points, open_points, read_header
+
+LEAF_SIZE = 256   # points per leaf block in the file
+
+
+@dataclass(slots=True)
+class FileKDTree:
+    # Bucket kd-tree over a point file. Points are stored reordered so every
+    # subtree is one contiguous run lo..hi-1 of `points`; `ids` maps a position
+    # back to the index in the source file. Only the node arrays live in memory.
+    points: np.ndarray   # (n, 2) memmap, leaf order
+    ids: np.ndarray      # (n,) memmap, position -> source index
+    lo: np.ndarray       # node -> first position of its run
+    hi: np.ndarray       # node -> one past the last position
+    left: np.ndarray     # node -> left child, -1 for a leaf
+    right: np.ndarray
+    axis: np.ndarray
+    split: np.ndarray    # left run <= split <= right run along axis
+    box: np.ndarray      # (4, m): subtree xmin, xmax, ymin, ymax per node
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class _Builder:
+    # Collects nodes; W/I are the writable point and id maps
+    def __init__(self, W: np.ndarray, I: np.ndarray, leaf_size: int, chunk_size: int, seed: int) -> None:
+        self.W, self.I = W, I
+        self.leaf_size = leaf_size
+        self.chunk_size = max(chunk_size, leaf_size)
+        self.rng = np.random.default_rng(seed)
+        self.nodes: list[list] = []   # [lo, hi, left, right, axis, split, box]
+        self.scratch: tuple[np.ndarray, np.ndarray] | None = None
+
+    def node(self, lo: int, hi: int, axis: int) -> int:
+        self.nodes.append([lo, hi, -1, -1, axis, 0.0, None])
+        return len(self.nodes) - 1
+
+    def build(self, lo: int, hi: int, depth: int) -> int:
+        if hi - lo <= self.chunk_size:
+            # Small enough: build the whole subtree in memory, write back once
+            pts = np.array(self.W[lo:hi])
+            ids = np.array(self.I[lo:hi])
+            k = self.block(pts, ids, lo, depth)
+            self.W[lo:hi] = pts
+            self.I[lo:hi] = ids
+            return k
+
+        a = depth % 2
+        k = self.node(lo, hi, a)
+        mid, pivot = self.partition(lo, hi, a)
+        self.nodes[k][5] = pivot
+        self.nodes[k][2] = self.build(lo, mid, depth + 1)
+        self.nodes[k][3] = self.build(mid, hi, depth + 1)
+        self.join_boxes(k)
+        return k
+
+    def block(self, pts: np.ndarray, ids: np.ndarray, base: int, depth: int) -> int:
+        # In-memory median split; pts/ids are permuted in place
+        n = len(pts)
+        a = depth % 2
+        k = self.node(base, base + n, a)
+        if n <= self.leaf_size:
+            self.nodes[k][6] = (pts[:, 0].min(), pts[:, 0].max(), pts[:, 1].min(), pts[:, 1].max())
+            return k
+
+        mid = n // 2
+        order = np.argpartition(pts[:, a], mid)
+        pts[:] = pts[order]
+        ids[:] = ids[order]
+        self.nodes[k][5] = pts[mid, a]
+        self.nodes[k][2] = self.block(pts[:mid], ids[:mid], base, depth + 1)
+        self.nodes[k][3] = self.block(pts[mid:], ids[mid:], base + mid, depth + 1)
+        self.join_boxes(k)
+        return k
+
+    def join_boxes(self, k: int) -> None:
+        bl, br = self.nodes[self.nodes[k][2]][6], self.nodes[self.nodes[k][3]][6]
+        self.nodes[k][6] = (min(bl[0], br[0]), max(bl[1], br[1]), min(bl[2], br[2]), max(bl[3], br[3]))
+
+    def partition(self, lo: int, hi: int, a: int) -> tuple[int, float]:
+        # Streamed three-way partition of lo..hi-1 around a sampled median:
+        # count pass, then a distribution pass into scratch files, then copy
+        # back. Returns the split position (inside the run equal to the pivot).
+        W, I, step = self.W, self.I, self.chunk_size
+        sample = np.sort(self.rng.choice(hi - lo, size=min(step, hi - lo), replace=False))
+        vals = np.sort(W[lo + sample, a])
+        pivot = float(vals[len(vals) // 2])
+
+        n_less = n_eq = 0
+        for s in range(lo, hi, step):
+            col = W[s : min(s + step, hi), a]
+            n_less += int((col < pivot).sum())
+            n_eq += int((col == pivot).sum())
+
+        SW, SI = self.scratch
+        pos = [lo, lo + n_less, lo + n_less + n_eq]
+        for s in range(lo, hi, step):
+            pts = np.array(W[s : min(s + step, hi)])
+            ids = np.array(I[s : min(s + step, hi)])
+            col = pts[:, a]
+            for part, mask in enumerate((col < pivot, col == pivot, col > pivot)):
+                c = int(mask.sum())
+                SW[pos[part] : pos[part] + c] = pts[mask]
+                SI[pos[part] : pos[part] + c] = ids[mask]
+                pos[part] += c
+        for s in range(lo, hi, step):
+            e = min(s + step, hi)
+            W[s:e] = SW[s:e]
+            I[s:e] = SI[s:e]
+
+        # The pivot is a real point, so both sides get at least one point
+        mid = min(max((lo + hi) // 2, lo + n_less), lo + n_less + n_eq)
+        return mid, pivot
+
+
+def build_kdtree_file(path: str | os.PathLike, out: str | os.PathLike | None = None,
+                      leaf_size: int = LEAF_SIZE, chunk_size: int = CHUNK_SIZE, seed: int = 0) -> FileKDTree:
+    # Writes out + ".pts" (points in leaf order) and out + ".ids" (.npy source
+    # indices); at most chunk_size points are held in memory at a time
+    dim, n = read_header(path)
+    if dim != 2:
+        raise ValueError("build_kdtree_file expects a 2D point file")
+    out = os.fspath(out if out is not None else os.fspath(path) + ".kd")
+
+    src = open_points(path)
+    W = create_points(out + ".pts", n)
+    I = np.lib.format.open_memmap(out + ".ids", mode="w+", dtype=np.int64, shape=(n,))
+    for s in range(0, n, chunk_size):
+        e = min(s + chunk_size, n)
+        W[s:e] = src[s:e]
+        I[s:e] = np.arange(s, e)
+
+    b = _Builder(W, I, leaf_size, chunk_size, seed)
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(out) or ".") as tmp:
+        if n > b.chunk_size:
+            b.scratch = (create_points(os.path.join(tmp, "scratch.pts"), n),
+                         np.lib.format.open_memmap(os.path.join(tmp, "scratch.ids"), mode="w+", dtype=np.int64, shape=(n,)))
+        if n:
+            b.build(0, n, 0)
+        b.scratch = None
+    if n:
+        W.flush()
+        I.flush()
+
+    return _file_tree(out, b.nodes)
+
+
+def _file_tree(out: str, nodes: list[list]) -> FileKDTree:
+    m = len(nodes)
+    cols = list(zip(*nodes)) if m else [()] * 7
+    return FileKDTree(
+        points=open_points(out + ".pts"),
+        ids=np.load(out + ".ids", mmap_mode="r"),
+        lo=np.array(cols[0], dtype=np.intp),
+        hi=np.array(cols[1], dtype=np.intp),
+        left=np.array(cols[2], dtype=np.intp),
+        right=np.array(cols[3], dtype=np.intp),
+        axis=np.array(cols[4], dtype=np.int8),
+        split=np.array(cols[5], dtype=np.float64),
+        box=np.array(cols[6], dtype=np.float64).reshape(m, 4).T,
+    )
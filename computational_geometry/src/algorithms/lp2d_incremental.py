@@ -1,13 +1,19 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional, List
+from concurrent.futures import ProcessPoolExecutor
 import random
 import math
 from src.geometry.primitives2d import Point2D
+from src.geometry.point_array import PointArray2D
+from src.geometry.predicates import ccw_batch, det2
+import numpy as np
 
+# Tolerance for tests on constructed points (vertices, offsets along a
+# boundary); tests on the input coefficients alone use exact signs
 EPS = 1e-9
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Halfplane:
     # a*x + b*y <= c
     a: float
@@ -31,8 +37,8 @@ def intersect_lines(h1: Halfplane, h2: Halfplane) -> Optional[Point2D]:
     # Intersection of boundary lines
     a1, b1, c1 = h1.a, h1.b, h1.c
     a2, b2, c2 = h2.a, h2.b, h2.c
-    det = a1 * b2 - a2 * b1
-    if abs(det) < EPS:
+    det = det2(a1, b1, a2, b2)
+    if det == 0:
         return None
     x = (c1 * b2 - c2 * b1) / det
     y = (a1 * c2 - a2 * c1) / det
@@ -49,7 +55,7 @@ def obj(p: Point2D, c1: float, c2: float) -> float:
 def _point_on_line(h: Halfplane) -> Point2D:
     # Find any point on the line a*x + b*y = c
     a, b, c = h.a, h.b, h.c
-    if abs(a) < EPS and abs(b) < EPS:
+    if a == 0 and b == 0:
         raise ValueError("Invalid constraint: a=b=0")
     if abs(b) >= abs(a):
         # x = 0
@@ -68,10 +74,10 @@ def _solve_on_boundary(boundary: Halfplane, prev: List[Halfplane], c1: float, c2
     tmax = math.inf
 
     for g in prev:
-        alpha = g.a * dx + g.b * dy
+        alpha = det2(g.a, -dy, g.b, dx)   # g.a * dx + g.b * dy
         beta = g.c - (g.a * p0.x + g.b * p0.y) 
 
-        if abs(alpha) < EPS:
+        if alpha == 0:
             if beta < -EPS:
                 raise ValueError("Infeasible on boundary.")
             continue
@@ -85,14 +91,14 @@ def _solve_on_boundary(boundary: Halfplane, prev: List[Halfplane], c1: float, c2
         if tmin > tmax + EPS:
             raise ValueError("Infeasible on boundary.")
 
-    slope = c1 * dx + c2 * dy
+    slope = det2(c1, -dy, c2, dx)   # c1 * dx + c2 * dy
 
     if math.isinf(tmin) or math.isinf(tmax):
         raise ValueError("Unbounded (missing box).")
 
-    if slope > EPS:
+    if slope > 0:
         t = tmax
-    elif slope < -EPS:
+    elif slope < 0:
         t = tmin
     else:
         t = min(max(0.0, tmin), tmax)
@@ -138,3 +144,177 @@ def solve_lp_incremental_2d(constraints: List[Halfplane], c1: float, c2: float,
     return p
 
 
+# Batch mode: many objectives over one constraint set. The constraints are
+# shuffled once and stored as a (3, 4 + n) array of a, b, c rows: the box of
+# solve_lp_incremental_2d first, then the constraints in shuffled order
+
+BOX_ROWS = 4
+ORIGIN = Point2D(0.0, 0.0)
+
+
+@dataclass(frozen=True, slots=True)
+class LPResult:
+    # status is "optimal", "unbounded" (the bounding box, not the
+    # constraints, limits the optimum) or "infeasible" (point is None)
+    status: str
+    point: Optional[Point2D]
+
+
+def lp_rows(constraints: List[Halfplane] | np.ndarray, seed: int = 0) -> np.ndarray:
+    # Box and shuffled constraints as coefficient rows; constraints is a list
+    # of Halfplanes or an (n, 3) array of a, b, c. Same permutation and box
+    # as solve_lp_incremental_2d with this seed.
+    if isinstance(constraints, np.ndarray):
+        abc = np.asarray(constraints, dtype=np.float64).reshape(-1, 3).T
+    else:
+        abc = np.array([(h.a, h.b, h.c) for h in constraints], dtype=np.float64).reshape(-1, 3).T
+    n = abc.shape[1]
+    if n == 0:
+        raise ValueError("No constraints given.")
+
+    order = list(range(n))
+    random.Random(seed).shuffle(order)
+    M = 1000.0 * max(1.0, float(np.max(np.abs(abc[2]))))
+    box = np.array([[1.0, -1.0, 0.0, 0.0], [0.0, 0.0, 1.0, -1.0], [M, M, M, M]])
+    return np.ascontiguousarray(np.hstack([box, abc[:, order]]))
+
+
+def _boundary_rows(rows: np.ndarray, j: int, c1: float, c2: float) -> Optional[tuple[float, float, int]]:
+    # _solve_on_boundary for row j against all rows before it, vectorized.
+    # Also returns the row that stops the optimum along the line (-1 if
+    # none); None if infeasible.
+    a, b, c = rows[:, j].tolist()
+    p0 = _point_on_line(Halfplane(a, b, c))
+    dx, dy = b, -a
+    A, B, C = rows[:, :j]
+
+    alpha = ccw_batch(ORIGIN, Point2D(dy, -dx), PointArray2D(rows[:2, :j]))   # A * dx + B * dy, exact sign
+    beta = C - (A * p0.x + B * p0.y)
+    par = alpha == 0
+    if np.any(beta[par] < -EPS):
+        return None
+
+    t_bound = np.divide(beta, alpha, out=np.zeros_like(beta), where=~par)
+    up = np.where(alpha > 0, t_bound, math.inf)
+    lo = np.where(alpha < 0, t_bound, -math.inf)
+    kmax, kmin = int(up.argmin()), int(lo.argmax())
+    tmax, tmin = float(up[kmax]), float(lo[kmin])
+    if tmin > tmax + EPS:
+        return None
+
+    slope = det2(c1, -dy, c2, dx)   # c1 * dx + c2 * dy
+    if slope > 0:
+        t, k = tmax, kmax
+    elif slope < 0:
+        t, k = tmin, kmin
+    else:
+        t = min(max(0.0, tmin), tmax)
+        k = kmax if t == tmax else kmin if t == tmin else -1
+    return p0.x + t * dx, p0.y + t * dy, k
+
+
+def _solve_rows(rows: np.ndarray, c1: float, c2: float) -> tuple[Optional[Point2D], Optional[tuple[int, int]]]:
+    # solve_lp_incremental_2d over the rows: one vectorized scan finds the
+    # next violated constraint. Returns the optimum (None if infeasible) and
+    # the two rows tight there when it is a vertex.
+    A, B, C = rows
+    M = float(C[0])
+    x, y = (M if c1 > 0 else -M), (M if c2 > 0 else -M)
+    tight = (0 if c1 > 0 else 1, 2 if c2 > 0 else 3)
+
+    i = BOX_ROWS
+    while True:
+        viol = np.flatnonzero(A[i:] * x + B[i:] * y > C[i:] + EPS)
+        if len(viol) == 0:
+            break
+        j = i + int(viol[0])
+        step = _boundary_rows(rows, j, c1, c2)
+        if step is None:
+            return None, None
+        x, y, k = step
+        tight = (j, k) if k >= 0 else None
+        i = j + 1
+
+    if np.any(A * x + B * y > C + EPS):
+        raise ValueError("Internal error: infeasible result.")
+    return Point2D(x, y), tight
+
+
+def _sign(v: float) -> int:
+    return (v > 0) - (v < 0)
+
+
+def _multipliers(rows: np.ndarray, tight: tuple[int, int], c1: float, c2: float) -> tuple[int, int]:
+    # Signs of li, lj in (c1, c2) = li * n_i + lj * n_j for the normals of the
+    # tight rows; both positive means the vertex is the unique optimum
+    i, j = tight
+    ai, bi, aj, bj = float(rows[0, i]), float(rows[1, i]), float(rows[0, j]), float(rows[1, j])
+    d = _sign(det2(ai, bi, aj, bj))
+    return _sign(det2(c1, c2, aj, bj)) * d, _sign(det2(ai, bi, c1, c2)) * d
+
+
+def _status(rows: np.ndarray, tight: Optional[tuple[int, int]], c1: float, c2: float) -> str:
+    # Unbounded when a box row carries part of the objective
+    if tight is None:
+        return "optimal"
+    lams = _multipliers(rows, tight, c1, c2)
+    return "unbounded" if any(r < BOX_ROWS and l > 0 for r, l in zip(tight, lams)) else "optimal"
+
+
+def solve_lp_rows(rows: np.ndarray, objectives: List[tuple[float, float]]) -> List[LPResult]:
+    # Solve each objective over lp_rows output. The previous optimal vertex
+    # is reused whenever the next objective lies strictly inside the cone of
+    # its tight normals, where it stays the unique optimum.
+    results: List[LPResult] = []
+    point: Optional[Point2D] = None
+    tight: Optional[tuple[int, int]] = None
+    for c1, c2 in objectives:
+        if tight is None or _multipliers(rows, tight, c1, c2) != (1, 1):
+            point, tight = _solve_rows(rows, c1, c2)
+            if point is None:
+                # The feasible region is the same for every objective
+                return results + [LPResult("infeasible", None)] * (len(objectives) - len(results))
+        results.append(LPResult(_status(rows, tight, c1, c2), point))
+    return results
+
+
+def solve_lp_batch(constraints: List[Halfplane] | np.ndarray, objectives: List[tuple[float, float]] | np.ndarray,
+                   seed: int = 0, workers: int = 1) -> List[LPResult]:
+    # Maximize every objective (c1, c2) over the same constraints; one
+    # LPResult per objective, in input order. Optimal points are those of
+    # solve_lp_incremental_2d with the same seed; infeasible and unbounded
+    # objectives are reported instead of raised.
+    rows = lp_rows(constraints, seed)
+    objs = np.asarray(objectives, dtype=np.float64).reshape(-1, 2)
+
+    # Angular order, so consecutive objectives tend to share their optimum
+    order = np.argsort(np.arctan2(objs[:, 1], objs[:, 0]), kind="stable")
+    cs = [(c1, c2) for c1, c2 in objs[order].tolist()]
+
+    if workers > 1 and len(cs) >= 2 * workers:
+        # Contiguous angular ranges per worker keep the warm starts useful
+        cuts = [len(cs) * w // workers for w in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_rows, initargs=(rows,)) as ex:
+            parts = list(ex.map(_solve_range, [cs[lo:hi] for lo, hi in zip(cuts[:-1], cuts[1:])]))
+        solved = [r for part in parts for r in part]
+    else:
+        solved = solve_lp_rows(rows, cs)
+
+    results: List[LPResult] = [None] * len(cs)
+    for k, r in zip(order.tolist(), solved):
+        results[k] = r
+    return results
+
+
+# Process pool: each worker gets the rows once and solves a range of objectives
+
+_worker_rows: np.ndarray | None = None
+
+
+def _attach_rows(rows: np.ndarray) -> None:
+    global _worker_rows
+    _worker_rows = rows
+
+
+def _solve_range(objectives: List[tuple[float, float]]) -> List[LPResult]:
+    return solve_lp_rows(_worker_rows, objectives)
@@ -0,0 +1,263 @@
+from __future__ import annotations
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+import numpy as np
+from src.geometry.primitives2d import Point2D
+from src.geometry.point_array import PointArray2D
+from src.algorithms.kdtree import KDNode, FlatKDTree
+from src.algorithms.kdtree_dynamic import DynamicKDTree
+from src.algorithms.kdtree_file import FileKDTree
+
+# Results follow range_search: Point2D objects for a KDNode tree,
+# indices into tree.points for a FlatKDTree, into the source file for a FileKDTree
+
+
+class _FlatView:
+    # FlatKDTree arrays for scalar traversal. Batches pay O(n) once for
+    # plain-list copies, which read much faster than numpy scalars.
+    __slots__ = ("n", "xs", "ys", "idx", "axis", "split")
+
+    def __init__(self, tree: FlatKDTree, as_lists: bool = True) -> None:
+        conv = (lambda a: a.tolist()) if as_lists else (lambda a: a)
+        self.n = len(tree)
+        self.xs = conv(tree.points.x)
+        self.ys = conv(tree.points.y)
+        self.idx = conv(tree.idx)
+        self.axis = conv(tree.axis)
+        self.split = conv(tree.split)
+
+
+def _knn_node(root: Optional[KDNode], qx: float, qy: float, k: int) -> list[tuple[float, Point2D]]:
+    heap: list[tuple[float, int, Point2D]] = []   # max-heap on distance via negation
+    tick = 0
+
+    def rec(node: Optional[KDNode]) -> None:
+        nonlocal tick
+        if node is None:
+            return
+        p = node.p
+        d = (p.x - qx) ** 2 + (p.y - qy) ** 2
+        tick += 1
+        if len(heap) < k:
+            heapq.heappush(heap, (-d, tick, p))
+        elif d < -heap[0][0]:
+            heapq.heapreplace(heap, (-d, tick, p))
+
+        diff = (qx - p.x) if node.axis == 0 else (qy - p.y)
+        near, far = (node.left, node.right) if diff < 0 else (node.right, node.left)
+        rec(near)
+        # Far side only if the splitting line is closer than the k-th best
+        if len(heap) < k or diff * diff < -heap[0][0]:
+            rec(far)
+
+    rec(root)
+    return [(-nd, p) for nd, _, p in sorted(heap, key=lambda e: (-e[0], e[1]))]
+
+
+def _knn_flat(t: _FlatView, qx: float, qy: float, k: int, alive: Optional[np.ndarray] = None) -> list[tuple[float, int]]:
+    heap: list[tuple[float, int]] = []
+    xs, ys, idx, axis, split, n = t.xs, t.ys, t.idx, t.axis, t.split, t.n
+
+    def rec(v: int) -> None:
+        if v >= n:
+            return
+        i = idx[v]
+        d = (xs[i] - qx) ** 2 + (ys[i] - qy) ** 2
+        if alive is not None and not alive[i]:
+            pass    # tombstone: still routes the search, never reported
+        elif len(heap) < k:
+            heapq.heappush(heap, (-d, i))
+        elif d < -heap[0][0]:
+            heapq.heapreplace(heap, (-d, i))
+
+        diff = (qx if axis[v] == 0 else qy) - split[v]
+        near, far = (2 * v + 1, 2 * v + 2) if diff < 0 else (2 * v + 2, 2 * v + 1)
+        rec(near)
+        if len(heap) < k or diff * diff < -heap[0][0]:
+            rec(far)
+
+    rec(0)
+    return sorted((-nd, i) for nd, i in heap)
+
+
+def _radius_node(root: Optional[KDNode], qx: float, qy: float, r: float) -> list[Point2D]:
+    r2 = r * r
+    out: list[Point2D] = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        p = node.p
+        if (p.x - qx) ** 2 + (p.y - qy) ** 2 <= r2:
+            out.append(p)
+        diff = (qx - p.x) if node.axis == 0 else (qy - p.y)
+        if diff <= r:
+            stack.append(node.left)
+        if diff >= -r:
+            stack.append(node.right)
+    return out
+
+
+def _radius_flat(t: _FlatView, qx: float, qy: float, r: float, alive: Optional[np.ndarray] = None) -> list[int]:
+    r2 = r * r
+    out: list[int] = []
+    stack = [0]
+    while stack:
+        v = stack.pop()
+        if v >= t.n:
+            continue
+        i = t.idx[v]
+        if (t.xs[i] - qx) ** 2 + (t.ys[i] - qy) ** 2 <= r2 and (alive is None or alive[i]):
+            out.append(i)
+        diff = (qx if t.axis[v] == 0 else qy) - t.split[v]
+        if diff <= r:
+            stack.append(2 * v + 1)
+        if diff >= -r:
+            stack.append(2 * v + 2)
+    return out
+
+
+def _knn_dynamic(root: DynamicKDTree, qx: float, qy: float, k: int) -> list[tuple[float, Point2D]]:
+    # Best k of each tree in the forest, merged
+    best = [((p.x - qx) ** 2 + (p.y - qy) ** 2, p) for p in root.buffer]
+    for b in root.buckets():
+        res = _knn_flat(_FlatView(b.tree, as_lists=False), qx, qy, k, b.alive)
+        best.extend((d, b.pts[i]) for d, i in res)
+    best.sort(key=lambda e: e[0])
+    return best[:k]
+
+
+def _box_dist2(t: FileKDTree, v: int, qx: float, qy: float) -> float:
+    xmin, xmax, ymin, ymax = t.box[:, v].tolist()
+    dx = max(xmin - qx, 0.0, qx - xmax)
+    dy = max(ymin - qy, 0.0, qy - ymax)
+    return dx * dx + dy * dy
+
+
+def _knn_file(t: FileKDTree, qx: float, qy: float, k: int) -> list[tuple[float, int]]:
+    # Best-first over nodes by box distance; each leaf is one block read
+    d = np.empty(0)
+    ids = np.empty(0, dtype=np.intp)
+    heap = [(0.0, 0)] if len(t.lo) else []
+    while heap:
+        bd, v = heapq.heappop(heap)
+        if len(d) == k and bd > d.max():
+            break
+        if t.left[v] >= 0:
+            for c in (t.left[v], t.right[v]):
+                heapq.heappush(heap, (_box_dist2(t, c, qx, qy), int(c)))
+            continue
+        pts = t.points[t.lo[v] : t.hi[v]]
+        d = np.concatenate([d, (pts[:, 0] - qx) ** 2 + (pts[:, 1] - qy) ** 2])
+        ids = np.concatenate([ids, t.ids[t.lo[v] : t.hi[v]]])
+        keep = np.lexsort((ids, d))[:k]
+        d, ids = d[keep], ids[keep]
+    return list(zip(d.tolist(), ids.tolist()))
+
+
+def _radius_file(t: FileKDTree, qx: float, qy: float, r: float) -> np.ndarray:
+    r2 = r * r
+    found: list[np.ndarray] = []
+    stack = [0] if len(t.lo) else []
+    while stack:
+        v = stack.pop()
+        if _box_dist2(t, v, qx, qy) > r2:
+            continue
+        if t.left[v] >= 0:
+            stack.extend((t.right[v], t.left[v]))
+            continue
+        pts = t.points[t.lo[v] : t.hi[v]]
+        inside = (pts[:, 0] - qx) ** 2 + (pts[:, 1] - qy) ** 2 <= r2
+        found.append(t.ids[t.lo[v] : t.hi[v]][inside])
+    return np.concatenate(found).astype(np.intp) if found else np.empty(0, dtype=np.intp)
+
+
+def knn(root: KDNode | FlatKDTree | DynamicKDTree | FileKDTree | None, q: Point2D, k: int) -> list[Point2D] | np.ndarray:
+    # k nearest points to q, closest first
+    if k <= 0:
+        raise ValueError("k must be positive")
+    if isinstance(root, DynamicKDTree):
+        return [p for _, p in _knn_dynamic(root, q.x, q.y, k)]
+    if isinstance(root, FlatKDTree):
+        res = _knn_flat(_FlatView(root, as_lists=False), q.x, q.y, k)
+        return np.array([i for _, i in res], dtype=np.intp)
+    if isinstance(root, FileKDTree):
+        return np.array([i for _, i in _knn_file(root, q.x, q.y, k)], dtype=np.intp)
+    return [p for _, p in _knn_node(root, q.x, q.y, k)]
+
+
+def nearest(root: KDNode | FlatKDTree | DynamicKDTree | FileKDTree | None, q: Point2D) -> Optional[Point2D] | Optional[int]:
+    # Closest point to q (None for an empty tree)
+    res = knn(root, q, 1)
+    if len(res) == 0:
+        return None
+    return int(res[0]) if isinstance(root, (FlatKDTree, FileKDTree)) else res[0]
+
+
+def radius_search(root: KDNode | FlatKDTree | DynamicKDTree | FileKDTree | None, q: Point2D, r: float) -> list[Point2D] | np.ndarray:
+    # All points within distance r of q (border included)
+    if isinstance(root, DynamicKDTree):
+        out = [p for p in root.buffer if (p.x - q.x) ** 2 + (p.y - q.y) ** 2 <= r * r]
+        for b in root.buckets():
+            found = _radius_flat(_FlatView(b.tree, as_lists=False), q.x, q.y, r, b.alive)
+            out.extend(b.pts[i] for i in found)
+        return out
+    if isinstance(root, FlatKDTree):
+        return np.array(_radius_flat(_FlatView(root, as_lists=False), q.x, q.y, r), dtype=np.intp)
+    if isinstance(root, FileKDTree):
+        return _radius_file(root, q.x, q.y, r)
+    return _radius_node(root, q.x, q.y, r)
+
+
+# -- batched queries --
+
+_worker_tree = None
+
+
+def _init_worker(tree) -> None:
+    global _worker_tree
+    _worker_tree = _FlatView(tree) if isinstance(tree, FlatKDTree) else tree
+
+
+def _knn_rows(t, qxs: list[float], qys: list[float], k: int) -> list[list]:
+    if isinstance(t, DynamicKDTree):
+        return [[p for _, p in _knn_dynamic(t, qx, qy, k)] for qx, qy in zip(qxs, qys)]
+    if isinstance(t, _FlatView):
+        return [[i for _, i in _knn_flat(t, qx, qy, k)] for qx, qy in zip(qxs, qys)]
+    return [[p for _, p in _knn_node(t, qx, qy, k)] for qx, qy in zip(qxs, qys)]
+
+
+def _knn_chunk(qxs: list[float], qys: list[float], k: int) -> list[list]:
+    return _knn_rows(_worker_tree, qxs, qys, k)
+
+
+def knn_batch(root: KDNode | FlatKDTree | DynamicKDTree | None, queries: list[Point2D] | PointArray2D, k: int, workers: int = 1) -> list[list[Point2D]] | np.ndarray:
+    # knn for many queries in one call; workers > 1 splits them across processes.
+    # A FlatKDTree answers with an (m, k) index array padded with -1.
+    if k <= 0:
+        raise ValueError("k must be positive")
+    if isinstance(queries, PointArray2D):
+        qxs, qys = queries.x.tolist(), queries.y.tolist()
+    else:
+        qxs, qys = [q.x for q in queries], [q.y for q in queries]
+
+    if workers <= 1 or len(qxs) < 2 * workers:
+        t = _FlatView(root) if isinstance(root, FlatKDTree) else root
+        rows = _knn_rows(t, qxs, qys, k)
+    else:
+        step = -(-len(qxs) // workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(root,)) as ex:
+            parts = ex.map(_knn_chunk,
+                           [qxs[s : s + step] for s in range(0, len(qxs), step)],
+                           [qys[s : s + step] for s in range(0, len(qys), step)],
+                           [k] * workers)
+            rows = [row for part in parts for row in part]
+
+    if not isinstance(root, FlatKDTree):
+        return rows
+    out = np.full((len(rows), k), -1, dtype=np.intp)
+    for r, row in enumerate(rows):
+        out[r, : len(row)] = row
+    return out
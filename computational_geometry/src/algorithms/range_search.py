@@ -1,7 +1,10 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from src.geometry.primitives2d import Point2D
-from src.algorithms.kdtree import KDNode
+from src.algorithms.kdtree import KDNode, FlatKDTree
+from src.algorithms.kdtree_dynamic import DynamicKDTree
+from src.algorithms.kdtree_file import FileKDTree
+import numpy as np
 
 @dataclass(frozen=True, slots=True)
 class Rect:
@@ -16,13 +19,40 @@ class Rect:
         in_y = self.ymin <= p.y <= self.ymax
         return in_x and in_y
 
-def range_search(root: KDNode | None, r: Rect) -> list[Point2D]:
-    # Report all points inside r
+def range_search(root: KDNode | FlatKDTree | DynamicKDTree | FileKDTree | None, r: Rect) -> list[Point2D] | np.ndarray:
+    # Report all points inside r (indices into tree.points for a FlatKDTree,
+    # into the source file for a FileKDTree)
+    if isinstance(root, FlatKDTree):
+        return range_search_flat(root, r)
+    if isinstance(root, FileKDTree):
+        return range_search_file(root, r)
+    if isinstance(root, DynamicKDTree):
+        result: list[Point2D] = [p for p in root.buffer if r.contains(p)]
+        for b in root.buckets():
+            found = range_search_flat(b.tree, r)
+            result.extend(b.pts[i] for i in found[b.alive[found]].tolist())
+        return result
+
     result: list[Point2D] = []
 
+    def report(node: KDNode | None) -> None:
+        # Whole subtree lies inside r: emit it without testing
+        if node is None:
+            return
+        result.append(node.p)
+        report(node.left)
+        report(node.right)
+
     def rec(node: KDNode | None) -> None:
         if node is None:
             return
+        if node.box is not None:
+            if box_disjoint(node.box, r):
+                return
+            if box_inside(node.box, r):
+                report(node)
+                return
+
         p = node.p
         if r.contains(p):   # Add point if it is inside
             result.append(p)
@@ -41,3 +71,164 @@ def range_search(root: KDNode | None, r: Rect) -> list[Point2D]:
 
     rec(root)
     return result
+
+
+def box_inside(box: tuple[float, float, float, float], r: Rect) -> bool:
+    # Subtree box (xmin, xmax, ymin, ymax) fully inside r
+    return r.xmin <= box[0] and box[1] <= r.xmax and r.ymin <= box[2] and box[3] <= r.ymax
+
+
+def box_disjoint(box: tuple[float, float, float, float], r: Rect) -> bool:
+    return box[1] < r.xmin or box[0] > r.xmax or box[3] < r.ymin or box[2] > r.ymax
+
+
+def range_count(root: KDNode | FlatKDTree | DynamicKDTree | FileKDTree | None, r: Rect) -> int:
+    # Number of points inside r; fully covered subtrees count in O(1)
+    if isinstance(root, FlatKDTree):
+        return int(_flat_pairs(root, _rect_array([r]), count_only=True)[0])
+    if isinstance(root, FileKDTree):
+        return int(range_search_file(root, r, count_only=True))
+    if isinstance(root, DynamicKDTree):
+        # Tombstones are not reflected in subtree sizes, so count the live hits
+        return (sum(1 for p in root.buffer if r.contains(p))
+                + sum(int(b.alive[range_search_flat(b.tree, r)].sum()) for b in root.buckets()))
+
+    def rec(node: KDNode | None) -> int:
+        if node is None or box_disjoint(node.box, r):
+            return 0
+        if box_inside(node.box, r):
+            return node.size
+        return int(r.contains(node.p)) + rec(node.left) + rec(node.right)
+
+    return rec(root)
+
+
+def range_search_flat(tree: FlatKDTree, r: Rect) -> np.ndarray:
+    # One whole tree level per step; covered subtrees are emitted in bulk
+    return _flat_pairs(tree, _rect_array([r]))[0]
+
+
+def range_search_file(tree: FileKDTree, r: Rect, count_only: bool = False) -> np.ndarray | int:
+    # Covered subtrees are reported as one slice of tree.ids; only leaves
+    # that straddle the border of r are read from disk
+    found: list[np.ndarray] = []
+    count = 0
+    stack = [0] if len(tree.lo) else []
+    while stack:
+        k = stack.pop()
+        box = tuple(tree.box[:, k])
+        if box_disjoint(box, r):
+            continue
+        lo, hi = tree.lo[k], tree.hi[k]
+        if box_inside(box, r):
+            count += hi - lo
+            if not count_only:
+                found.append(tree.ids[lo:hi])
+        elif tree.left[k] < 0:
+            pts = tree.points[lo:hi]
+            mask = (r.xmin <= pts[:, 0]) & (pts[:, 0] <= r.xmax) & (r.ymin <= pts[:, 1]) & (pts[:, 1] <= r.ymax)
+            count += int(mask.sum())
+            if not count_only:
+                found.append(tree.ids[lo:hi][mask])
+        else:
+            stack.append(tree.right[k])
+            stack.append(tree.left[k])
+
+    if count_only:
+        return count
+    return np.concatenate(found).astype(np.intp) if found else np.empty(0, dtype=np.intp)
+
+
+def range_search_batch(root: KDNode | FlatKDTree | None, rects: list[Rect]) -> list[list[Point2D]] | list[np.ndarray]:
+    # Answer many rectangles with a single traversal; one result per rectangle
+    R = _rect_array(rects)
+    if isinstance(root, FlatKDTree):
+        return _flat_pairs(root, R)
+
+    results: list[list[Point2D]] = [[] for _ in rects]
+
+    def report(node: KDNode | None, out: list[Point2D]) -> None:
+        if node is None:
+            return
+        out.append(node.p)
+        report(node.left, out)
+        report(node.right, out)
+
+    def rec(node: KDNode | None, act: np.ndarray) -> None:
+        if node is None or len(act) == 0:
+            return
+        x0, x1, y0, y1 = node.box
+        rx0, rx1, ry0, ry1 = R[:, act]
+        act = act[~((x1 < rx0) | (x0 > rx1) | (y1 < ry0) | (y0 > ry1))]
+        rx0, rx1, ry0, ry1 = R[:, act]
+        covered = (rx0 <= x0) & (x1 <= rx1) & (ry0 <= y0) & (y1 <= ry1)
+        for j in act[covered].tolist():
+            report(node, results[j])
+        act = act[~covered]
+        if len(act) == 0:
+            return
+
+        p = node.p
+        rx0, rx1, ry0, ry1 = R[:, act]
+        hit = (rx0 <= p.x) & (p.x <= rx1) & (ry0 <= p.y) & (p.y <= ry1)
+        for j in act[hit].tolist():
+            results[j].append(p)
+        rec(node.left, act)
+        rec(node.right, act)
+
+    rec(root, np.arange(len(rects)))
+    return results
+
+
+def _rect_array(rects: list[Rect]) -> np.ndarray:
+    # (4, m) array of xmin, xmax, ymin, ymax
+    return np.array([[r.xmin, r.xmax, r.ymin, r.ymax] for r in rects], dtype=np.float64).reshape(-1, 4).T
+
+
+def _flat_pairs(tree: FlatKDTree, R: np.ndarray, count_only: bool = False):
+    # Level-synchronous traversal over (node, rectangle) pairs
+    n, m = len(tree), R.shape[1]
+    xs, ys = tree.points.x, tree.points.y
+    counts = np.zeros(m, dtype=np.intp)
+    hits: list[tuple[np.ndarray, np.ndarray]] = []     # (rect, point index) pairs
+    covered: list[tuple[np.ndarray, np.ndarray]] = []  # (rect, node) pairs
+
+    fn = np.zeros(m if n else 0, dtype=np.intp)
+    fr = np.arange(len(fn))
+    while len(fn):
+        bx0, bx1, by0, by1 = tree.box[:, fn]
+        rx0, rx1, ry0, ry1 = R[:, fr]
+        keep = ~((bx1 < rx0) | (bx0 > rx1) | (by1 < ry0) | (by0 > ry1))
+        inside = keep & (rx0 <= bx0) & (bx1 <= rx1) & (ry0 <= by0) & (by1 <= ry1)
+        np.add.at(counts, fr[inside], tree.size[fn[inside]])
+        if not count_only:
+            covered.append((fr[inside], fn[inside]))
+
+        part = keep & ~inside
+        fn, fr = fn[part], fr[part]
+        pi = tree.idx[fn]
+        px, py = xs[pi], ys[pi]
+        rx0, rx1, ry0, ry1 = R[:, fr]
+        hit = (rx0 <= px) & (px <= rx1) & (ry0 <= py) & (py <= ry1)
+        np.add.at(counts, fr[hit], 1)
+        if not count_only:
+            hits.append((fr[hit], pi[hit]))
+
+        left, right = 2 * fn + 1, 2 * fn + 2
+        fn = np.concatenate([left[left < n], right[right < n]])
+        fr = np.concatenate([fr[left < n], fr[right < n]])
+
+    if count_only:
+        return counts
+
+    out: list[list[np.ndarray]] = [[] for _ in range(m)]
+    for rr, pp in hits:
+        if len(rr):
+            order = np.argsort(rr, kind="stable")
+            bounds = np.searchsorted(rr[order], np.arange(m + 1))
+            for j in np.flatnonzero(np.diff(bounds)).tolist():
+                out[j].append(pp[order[bounds[j] : bounds[j + 1]]])
+    for rr, nn in covered:
+        for j, k in zip(rr.tolist(), nn.tolist()):
+            out[j].append(tree.subtree(k))
+    return [np.concatenate(parts) if parts else np.empty(0, dtype=np.intp) for parts in out]
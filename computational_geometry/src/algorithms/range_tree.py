@@ -0,0 +1,102 @@
+from __future__ import annotations
+import numpy as np
+from src.geometry.primitives2d import Point2D
+from src.geometry.point_array import PointArray2D
+from src.algorithms.range_search import Rect
+
+
+class RangeTree2D:
+    # Layered range tree: a static segment tree over the x-order whose nodes
+    # keep their points sorted by y. Levels are stored as flat arrays: node
+    # [lo, hi) of level d occupies positions lo..hi-1 of ids[d]. Fractional
+    # cascading: left_before[d][p] counts the entries of p's node before p that
+    # go to the left child, so a y-position found once at the root is carried
+    # down in O(1) per node. Query O(log n + k), memory O(n log n).
+
+    def __init__(self, points: list[Point2D] | PointArray2D) -> None:
+        self.as_indices = isinstance(points, PointArray2D)
+        self.points = points
+        P = points if self.as_indices else PointArray2D.from_points(points)
+        n = len(P)
+        self.n = n
+
+        order_x = np.lexsort((P.y, P.x))
+        order_y = np.lexsort((P.x, P.y))
+        self.xs_sorted = P.x[order_x]
+        self.ys_sorted = P.y[order_y]
+        xrank = np.empty(n, dtype=np.intp)
+        xrank[order_x] = np.arange(n)
+
+        # Level 0 holds every point in y order; each level splits its nodes at mid
+        self.ids: list[np.ndarray] = []
+        self.left_before: list[np.ndarray] = []
+        ids = order_y
+        starts = np.zeros(1 if n else 0, dtype=np.intp)
+        ends = np.full(len(starts), n, dtype=np.intp)
+        pos = np.arange(n)
+        while True:
+            self.ids.append(ids)
+            split = ends - starts > 1
+            if not split.any():
+                break
+            block = np.searchsorted(starts, pos, side="right") - 1
+            mids = (starts + ends) // 2
+            go_left = xrank[ids] < mids[block]
+
+            csum = np.cumsum(go_left)
+            before = csum - go_left - (csum - go_left)[starts][block]
+            self.left_before.append(before)
+
+            child = np.where(go_left, starts[block] + before, mids[block] + (pos - starts[block] - before))
+            nxt = np.empty(n, dtype=np.intp)
+            nxt[child] = ids
+            ids = nxt
+
+            starts, ends = (np.column_stack([starts, np.where(split, mids, ends)]).ravel(),
+                            np.column_stack([np.where(split, mids, starts), ends]).ravel())
+            keep = ends > starts
+            starts, ends = starts[keep], ends[keep]
+
+    def _canonical(self, r: Rect):
+        # Yields (level, first position, last position) of each canonical block
+        if self.n == 0:
+            return
+        a = int(np.searchsorted(self.xs_sorted, r.xmin, side="left"))
+        b = int(np.searchsorted(self.xs_sorted, r.xmax, side="right"))
+        # The y-range is a range of positions in the (y, x) order of level 0,
+        # not of distinct y values: equal ys sit next to each other, so both
+        # bounds take all of a tied run or none of it, and the children keep
+        # that order, so positions carry down unchanged
+        ylo = int(np.searchsorted(self.ys_sorted, r.ymin, side="left"))
+        yhi = int(np.searchsorted(self.ys_sorted, r.ymax, side="right"))
+        if a >= b or ylo >= yhi:
+            return
+
+        stack = [(0, 0, self.n, ylo, yhi)]    # (level, lo, hi, y-range within node)
+        while stack:
+            d, lo, hi, pl, ph = stack.pop()
+            if pl >= ph or b <= lo or hi <= a:
+                continue
+            if a <= lo and hi <= b:
+                yield d, lo + pl, lo + ph
+                continue
+
+            mid = (lo + hi) // 2
+            lb = self.left_before[d]
+            # Carry the y-range to both children
+            ll = lb[lo + pl] if pl < hi - lo else mid - lo
+            lh = lb[lo + ph] if ph < hi - lo else mid - lo
+            stack.append((d + 1, mid, hi, pl - ll, ph - lh))
+            stack.append((d + 1, lo, mid, ll, lh))
+
+    def count(self, r: Rect) -> int:
+        # Number of points inside r
+        return sum(e - s for _, s, e in self._canonical(r))
+
+    def query(self, r: Rect) -> list[Point2D] | np.ndarray:
+        # Points inside r (indices for PointArray2D input)
+        parts = [self.ids[d][s:e] for d, s, e in self._canonical(r)]
+        found = np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+        if self.as_indices:
+            return found
+        return [self.points[i] for i in found.tolist()]
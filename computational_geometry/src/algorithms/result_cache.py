@@ -0,0 +1,193 @@
+from __future__ import annotations
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+import numpy as np
+from src.geometry.primitives2d import Point2D
+from src.geometry.point_array import PointArray2D, unique_sorted_indices
+from src.algorithms.delaunay_lifting import delaunay_triangulation_lifting
+from src.algorithms.kdtree import KDNode, FlatKDTree, build_kdtree, build_flat_kdtree
+
+# Opt-in result cache. Entries are keyed by a hash of the canonical input
+# (coordinates sorted by (x, y), deduplicated where the algorithm drops
+# duplicates) plus the algorithm and its arguments, and hold the result in
+# canonical positions; each call maps it back to the caller's points. So
+# the same point set hits in any order and as lists or arrays.
+
+MAX_BYTES = 256 * 2**20
+NODE_BYTES = 300     # rough footprint of one KDNode with its point and box
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0           # found in memory
+    disk_hits: int = 0      # found on disk (then kept in memory)
+    misses: int = 0         # computed
+    evictions: int = 0      # dropped from memory to stay under max_bytes
+    extended: int = 0       # hulls computed from a cached hull plus new points
+
+
+def _canonical(P: PointArray2D, dedup: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    # Caller indices in canonical order and the canonical (2, m) coordinates
+    # (+ 0.0 turns -0.0 into 0.0, so equal points hash alike)
+    order = unique_sorted_indices(P) if dedup else np.lexsort(P.data[::-1])
+    return order, np.ascontiguousarray(P.data[:, order] + 0.0)
+
+
+def _points(C: np.ndarray, pos: np.ndarray) -> list[Point2D]:
+    return [Point2D(x, y) for x, y in C[:, pos].T.tolist()]
+
+
+def _frozen(a: np.ndarray) -> np.ndarray:
+    # Cached arrays are shared between callers
+    a.flags.writeable = False
+    return a
+
+
+def _frozen_flat(t: FlatKDTree) -> FlatKDTree:
+    for a in (t.points.data, t.idx, t.axis, t.split, t.box, t.size):
+        _frozen(a)
+    return t
+
+
+def _name(fn: Callable) -> str:
+    return f"{fn.__module__}.{fn.__qualname__}"
+
+
+def _nbytes(value) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, FlatKDTree):
+        return sum(a.nbytes for a in (value.points.data, value.idx, value.axis, value.split, value.box, value.size))
+    if isinstance(value, KDNode):
+        return value.size * NODE_BYTES
+    return 0
+
+
+def _remap(node: Optional[KDNode], order: Optional[np.ndarray]) -> Optional[KDNode]:
+    # Copy of a canonical pointer tree with idx into the caller's array
+    # (order) or -1 for list input (order None)
+    if node is None:
+        return None
+    return KDNode(node.p, node.axis, _remap(node.left, order), _remap(node.right, order),
+                  int(order[node.idx]) if order is not None else -1, node.size, node.box)
+
+
+class ResultCache:
+    # In-memory LRU bounded by max_bytes, optionally backed by a directory
+    # of pickled results (not bounded; shared by processes using the same
+    # directory). Cached results are shared: do not modify them.
+
+    def __init__(self, max_bytes: int = MAX_BYTES, directory: Optional[str | os.PathLike] = None) -> None:
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.stats = CacheStats()
+        self.nbytes = 0
+        self._mem: OrderedDict[str, tuple[object, int]] = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._mem)
+
+    def clear(self) -> None:
+        # Empty the memory tier; the disk tier is left alone
+        self._mem.clear()
+        self.nbytes = 0
+
+    def key(self, name: str, C: np.ndarray, **kwargs) -> str:
+        h = hashlib.blake2b(C, digest_size=16)
+        h.update(f"{name}{sorted(kwargs.items())}".encode())
+        return h.hexdigest()
+
+    def get(self, key: str, compute: Callable[[], object]) -> object:
+        # Memory, then disk, then compute; every result ends up in memory
+        # (unless larger than max_bytes) and on disk
+        if key in self._mem:
+            self._mem.move_to_end(key)
+            self.stats.hits += 1
+            return self._mem[key][0]
+
+        path = os.path.join(self.directory, key + ".pkl") if self.directory is not None else None
+        if path is not None and os.path.exists(path):
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            self.stats.disk_hits += 1
+        else:
+            value = compute()
+            self.stats.misses += 1
+            if path is not None:
+                # Write then rename, so readers never see a partial file
+                fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)
+        self._put(key, value)
+        return value
+
+    def _put(self, key: str, value: object) -> None:
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        self._mem[key] = (value, size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (_, dropped) = self._mem.popitem(last=False)
+            self.nbytes -= dropped
+            self.stats.evictions += 1
+
+    def hull(self, fn: Callable, points: list[Point2D] | PointArray2D, **kwargs) -> list[Point2D] | np.ndarray:
+        # fn(points, **kwargs) for any convex_hull_* function, cached
+        P = points if isinstance(points, PointArray2D) else PointArray2D.from_points(points)
+        order, C = _canonical(P)
+        pos = self.get(self.key(_name(fn), C, **kwargs),
+                       lambda: _frozen(np.asarray(fn(PointArray2D(C), **kwargs), dtype=np.intp)))
+        return order[pos] if isinstance(points, PointArray2D) else _points(C, pos)
+
+    def hull_extend(self, fn: Callable, base: list[Point2D] | PointArray2D, new: list[Point2D] | PointArray2D,
+                    **kwargs) -> list[Point2D] | np.ndarray:
+        # Hull of base plus new, as fn would return it for their concatenation
+        # (indices into it for arrays). Only the (cached) hull of base and
+        # the new points go to fn.
+        B = base if isinstance(base, PointArray2D) else PointArray2D.from_points(base)
+        N = new if isinstance(new, PointArray2D) else PointArray2D.from_points(new)
+        U = PointArray2D(np.hstack([B.data, N.data]))
+        order, C = _canonical(U)
+
+        def compute() -> np.ndarray:
+            # Candidates keep base before new, so duplicates resolve to the
+            # first occurrence like fn on U would
+            self.stats.extended += 1
+            cand = np.concatenate([self.hull(fn, B, **kwargs), len(B) + np.arange(len(N))])
+            found = cand[np.asarray(fn(U.take(cand), **kwargs), dtype=np.intp)]
+            at = np.empty(len(U), dtype=np.intp)
+            at[order] = np.arange(len(order))
+            return _frozen(at[found])
+
+        pos = self.get(self.key(_name(fn), C, **kwargs), compute)
+        return order[pos] if isinstance(base, PointArray2D) else _points(C, pos)
+
+    def delaunay(self, points: list[Point2D] | PointArray2D, method: str = "lifting") -> tuple[list[Point2D], list[tuple[int, int, int]]] | tuple[PointArray2D, np.ndarray]:
+        # delaunay_triangulation_lifting(points, method), cached
+        P = points if isinstance(points, PointArray2D) else PointArray2D.from_points(points)
+        order, C = _canonical(P)
+        tris = self.get(self.key("delaunay", C, method=method),
+                        lambda: _frozen(delaunay_triangulation_lifting(PointArray2D(C), method=method)[1]))
+        if isinstance(points, PointArray2D):
+            return points, order[tris]
+        return _points(C, np.arange(C.shape[1])), [tuple(t) for t in tris.tolist()]
+
+    def kdtree(self, points: list[Point2D] | PointArray2D, flat: bool = False) -> Optional[KDNode] | FlatKDTree:
+        # build_kdtree(points), or build_flat_kdtree with flat=True, cached.
+        # Duplicates are kept, as the trees keep them.
+        P = points if isinstance(points, PointArray2D) else PointArray2D.from_points(points)
+        order, C = _canonical(P, dedup=False)
+        if flat:
+            t = self.get(self.key("flat_kdtree", C), lambda: _frozen_flat(build_flat_kdtree(PointArray2D(C))))
+            return FlatKDTree(P, order[t.idx], t.axis, t.split, t.box, t.size)
+        root = self.get(self.key("kdtree", C), lambda: build_kdtree(PointArray2D(C)))
+        return _remap(root, order if isinstance(points, PointArray2D) else None)
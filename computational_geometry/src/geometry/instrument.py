@@ -0,0 +1,165 @@
+from __future__ import annotations
+import sys
+import time
+from types import FunctionType
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+# Opt-in instrumentation. While no instrument() block is open, predicates are
+# the plain functions and phase()/depth()/active() reduce to one list check,
+# so algorithms run at full speed. Inside a block, every src.* reference to a
+# predicate is swapped for a counting wrapper and phases are timed.
+
+PREDICATES = ("ccw", "ccw_xy", "ccw_cmp", "dist2", "orient3d", "incircle", "incircle_xy", "det2",
+              "ccw_batch", "dist2_batch", "orient3d_batch", "incircle_batch")
+# Adaptive predicates: they count their filter misses in predicates.EXACT
+FILTERED = ("ccw", "ccw_xy", "ccw_cmp", "orient3d", "incircle_xy", "det2",
+            "ccw_batch", "orient3d_batch", "incircle_batch")
+
+
+@dataclass
+class Stats:
+    calls: Counter = field(default_factory=Counter)     # predicate -> evaluations (one per batch element)
+    batches: Counter = field(default_factory=Counter)   # batched predicate -> calls
+    time: Counter = field(default_factory=Counter)      # phase -> seconds
+    entries: Counter = field(default_factory=Counter)   # phase -> times entered
+    depth: dict[str, int] = field(default_factory=dict) # recursion -> deepest level reached
+    exact: Counter = field(default_factory=Counter)     # predicate -> filter misses (exact fallbacks)
+    counts: Counter = field(default_factory=Counter)    # event -> total, e.g. "prefilter.removed" -> points
+
+    def filter(self) -> dict[str, tuple[int, int]]:
+        # adaptive predicate -> (filter hits, misses); incircle is counted under incircle_xy
+        return {name: (n - self.exact[name], self.exact[name]) for name, n in self.calls.items() if name in FILTERED}
+
+    def as_dict(self) -> dict:
+        return {"calls": dict(self.calls), "batches": dict(self.batches), "time": dict(self.time),
+                "entries": dict(self.entries), "depth": dict(self.depth), "exact": dict(self.exact),
+                "counts": dict(self.counts)}
+
+
+_stack: list[Stats] = []
+_patched: dict[Callable, Callable] = {}         # wrapper -> original
+
+
+def active() -> Optional[Stats]:
+    # Innermost open Stats, None when instrumentation is off
+    return _stack[-1] if _stack else None
+
+
+class _Phase:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        dt = time.perf_counter() - self.t0
+        for st in _stack:
+            st.time[self.name] += dt
+            st.entries[self.name] += 1
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(name: str) -> _Phase | _NoPhase:
+    # with phase("merge"): ... adds the block's wall time to every open Stats
+    return _Phase(name) if _stack else _NO_PHASE
+
+
+def add_time(name: str, seconds: float) -> None:
+    # For hot loops that time themselves behind an `if active():` check
+    for st in _stack:
+        st.time[name] += seconds
+        st.entries[name] += 1
+
+
+def depth(name: str, d: int) -> None:
+    # Record reaching recursion level d
+    for st in _stack:
+        if d > st.depth.get(name, -1):
+            st.depth[name] = d
+
+
+def count(name: str, n: int) -> None:
+    # Add n to an event total
+    for st in _stack:
+        st.counts[name] += n
+
+
+def _counting(name: str, fn: Callable) -> Callable:
+    if name.endswith("_batch"):
+        def counted(*args):
+            out = fn(*args)
+            for st in _stack:
+                st.calls[name] += out.size
+                st.batches[name] += 1
+            return out
+    else:
+        def counted(*args):
+            for st in _stack:
+                st.calls[name] += 1
+            return fn(*args)
+    return counted
+
+
+def _swap(mapping: dict[Callable, Callable]) -> None:
+    # Replace every src.* module attribute found in mapping
+    for mod in list(sys.modules.values()):
+        if not getattr(mod, "__name__", "").startswith("src."):
+            continue
+        for attr, val in list(vars(mod).items()):
+            if isinstance(val, FunctionType) and val in mapping:
+                setattr(mod, attr, mapping[val])
+
+
+def _enable() -> None:
+    from src.geometry import predicates
+    wrappers: dict[Callable, Callable] = {}
+    for name in PREDICATES:
+        fn = getattr(predicates, name, None)
+        if fn is not None:
+            wrappers[fn] = _counting(name, fn)
+    _swap(wrappers)
+    _patched.update({w: fn for fn, w in wrappers.items()})
+
+
+def _disable() -> None:
+    _swap(_patched)
+    _patched.clear()
+
+
+@contextmanager
+def instrument(hook: Optional[Callable[[Stats], None]] = None) -> Iterator[Stats]:
+    # with instrument() as stats: run(); stats.calls["ccw"], stats.time["merge"], ...
+    # hook, if given, receives the Stats when the block ends (e.g. to export metrics)
+    from src.geometry.predicates import EXACT
+    stats = Stats()
+    if not _stack:
+        _enable()
+    _stack.append(stats)
+    before = EXACT.copy()
+    try:
+        yield stats
+    finally:
+        stats.exact = EXACT - before
+        _stack.pop()
+        if not _stack:
+            _disable()
+        if hook is not None:
+            hook(stats)
@@ -1,85 +1,179 @@
 from __future__ import annotations
+import os
 from pathlib import Path
-import matplotlib.pyplot as plt
+from typing import TYPE_CHECKING, Optional, Sequence
+import numpy as np
 from .primitives2d import Point2D
-from src.algorithms.kdtree import KDNode
-from src.algorithms.range_search import Rect
-
-def plot_points_and_hull(points: list[Point2D], hull: list[Point2D], show: bool = True, title=None) -> None:
-    # Scatter plot of input points
-    xs = [p.x for p in points]
-    ys = [p.y for p in points]
-
-    plt.figure()
-    plt.scatter(xs, ys)
-
-    if len(hull) >= 2:
-        hx = [p.x for p in hull] + [hull[0].x]
-        hy = [p.y for p in hull] + [hull[0].y]
-        plt.plot(hx, hy)
+from .point_array import PointArray2D
+
+# matplotlib and the kd-tree classes are imported inside the functions, so
+# importing this module costs nothing until something is drawn
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+    from src.algorithms.kdtree import KDNode, FlatKDTree
+    from src.algorithms.range_search import Rect
+
+# Above this many points a cloud is drawn as a density image instead of a
+# scatter, and highlighted subsets are thinned to this many markers
+MAX_POINTS = 20_000
+DENSITY_BINS = 512
+
+SaveTo = Optional[str | os.PathLike]
+
+
+def _figure(save_to: SaveTo) -> tuple[Figure, Axes]:
+    # A standalone Figure when saving: it renders through Agg without
+    # pyplot, so no GUI backend or display is needed
+    if save_to is not None:
+        from matplotlib.figure import Figure
+        fig = Figure()
+    else:
+        import matplotlib.pyplot as plt
+        fig = plt.figure()
+    return fig, fig.add_subplot()
 
-    if title:
-        plt.title(title)
 
+def _finish(fig: Figure, save_to: SaveTo, show: bool) -> None:
+    if save_to is not None:
+        fig.savefig(Path(save_to))
+        return
+    import matplotlib.pyplot as plt
     if show:
         plt.show()
     else:
-        plt.close()
+        plt.close(fig)
 
 
-def plot_kdtree(points, root, title: str = "KD-tree"):
-    # Plot points + kd-tree split lines   
-    if not points:
+def _xy(points: Sequence[Point2D] | PointArray2D) -> tuple[np.ndarray, np.ndarray]:
+    if isinstance(points, PointArray2D):
+        return points.x, points.y
+    n = len(points)
+    return np.fromiter((p.x for p in points), np.float64, n), np.fromiter((p.y for p in points), np.float64, n)
+
+
+def _thin(xs: np.ndarray, ys: np.ndarray, max_points: int) -> tuple[np.ndarray, np.ndarray]:
+    # Evenly spaced subset of at most max_points
+    if len(xs) <= max_points:
+        return xs, ys
+    keep = np.linspace(0, len(xs) - 1, max_points).astype(np.intp)
+    return xs[keep], ys[keep]
+
+
+def _cloud(ax: Axes, xs: np.ndarray, ys: np.ndarray, max_points: int, **kwargs) -> None:
+    # Scatter small clouds; bin large ones into a log-scaled density image
+    if len(xs) <= max_points:
+        ax.scatter(xs, ys, **kwargs)
         return
+    counts, xe, ye = np.histogram2d(xs, ys, bins=DENSITY_BINS)
+    ax.imshow(np.log1p(counts.T), origin="lower", extent=(xe[0], xe[-1], ye[0], ye[-1]),
+              aspect="auto", cmap="Greys", interpolation="nearest")
+
+
+def plot_points_and_hull(points: list[Point2D] | PointArray2D, hull: list[Point2D] | np.ndarray, show: bool = True,
+                         title=None, save_to: SaveTo = None, max_points: int = MAX_POINTS) -> None:
+    # Input points plus the closed hull polygon; hull is a list of points, or
+    # an index array into a PointArray2D as the hull functions return it
+    xs, ys = _xy(points)
+    fig, ax = _figure(save_to)
+    _cloud(ax, xs, ys, max_points)
+
+    if len(hull) >= 2:
+        if isinstance(hull, np.ndarray):
+            hx, hy = xs[hull], ys[hull]
+        else:
+            hx, hy = _xy(hull)
+        ax.plot(np.append(hx, hx[0]), np.append(hy, hy[0]))
 
-    xs = [p.x for p in points]
-    ys = [p.y for p in points]
+    if title:
+        ax.set_title(title)
+    _finish(fig, save_to, show)
 
-    xmin, xmax = min(xs), max(xs)
-    ymin, ymax = min(ys), max(ys)
 
-    plt.figure()
-    plt.scatter(xs, ys)
+def kdtree_segments(root: KDNode | FlatKDTree | None, box: tuple[float, float, float, float],
+                    max_depth: Optional[int] = None) -> list[tuple[tuple[float, float], tuple[float, float]]]:
+    # Split lines of the tree clipped to their cells, down to max_depth
+    # (None: all levels)
+    from src.algorithms.kdtree import FlatKDTree
+    x0, x1, y0, y1 = box
+    segs: list[tuple[tuple[float, float], tuple[float, float]]] = []
+    deep = max_depth if max_depth is not None else np.inf
 
-    def rec(node: KDNode | None, x0: float, x1: float, y0: float, y1: float) -> None:
-        if node is None: 
+    def rec(node: KDNode | None, x0: float, x1: float, y0: float, y1: float, d: int) -> None:
+        if node is None or d > deep:
             return
-        
         p = node.p
         if node.axis == 0:
             # Vertical split
-            plt.plot([p.x, p.x], [y0, y1])
-            rec(node.left, x0, p.x, y0, y1)
-            rec(node.right, p.x, x1, y0, y1)
+            segs.append(((p.x, y0), (p.x, y1)))
+            rec(node.left, x0, p.x, y0, y1, d + 1)
+            rec(node.right, p.x, x1, y0, y1, d + 1)
         else:
             # Horizontal split
-            plt.plot([x0, x1], [p.y, p.y])
-            rec(node.left, x0, x1, y0, p.y)
-            rec(node.right, x0, x1, p.y, y1)
+            segs.append(((x0, p.y), (x1, p.y)))
+            rec(node.left, x0, x1, y0, p.y, d + 1)
+            rec(node.right, x0, x1, p.y, y1, d + 1)
+
+    def rec_flat(k: int, x0: float, x1: float, y0: float, y1: float, d: int) -> None:
+        if k >= n or d > deep:
+            return
+        s = split[k]
+        if axis[k] == 0:
+            segs.append(((s, y0), (s, y1)))
+            rec_flat(2 * k + 1, x0, s, y0, y1, d + 1)
+            rec_flat(2 * k + 2, s, x1, y0, y1, d + 1)
+        else:
+            segs.append(((x0, s), (x1, s)))
+            rec_flat(2 * k + 1, x0, x1, y0, s, d + 1)
+            rec_flat(2 * k + 2, x0, x1, s, y1, d + 1)
+
+    if isinstance(root, FlatKDTree):
+        n, split, axis = len(root), root.split.tolist(), root.axis.tolist()
+        rec_flat(0, x0, x1, y0, y1, 0)
+    else:
+        rec(root, x0, x1, y0, y1, 0)
+    return segs
+
+
+def plot_kdtree(points, root, title: str = "KD-tree", show: bool = True, save_to: SaveTo = None,
+                max_depth: Optional[int] = None, max_points: int = MAX_POINTS) -> None:
+    # Plot points + kd-tree split lines, all splits in one LineCollection
+    from matplotlib.collections import LineCollection
+    if len(points) == 0:
+        return
 
-    rec(root, xmin, xmax, ymin, ymax)
-    plt.title(title)
-    plt.axis("equal")
-    plt.show()
+    xs, ys = _xy(points)
+    fig, ax = _figure(save_to)
+    _cloud(ax, xs, ys, max_points)
 
+    box = (float(xs.min()), float(xs.max()), float(ys.min()), float(ys.max()))
+    ax.add_collection(LineCollection(kdtree_segments(root, box, max_depth), colors="C1", linewidths=0.8))
+    ax.set_title(title)
+    ax.axis("equal")
+    _finish(fig, save_to, show)
 
-def plot_range(points, r, reported, title: str = "Range query"):
-    # Plot rectangle + reported points
-    plt.figure()
-    xs = [p.x for p in points]
-    ys = [p.y for p in points]
-    plt.scatter(xs, ys, label="points")
+
+def plot_range(points, r: Rect, reported, title: str = "Range query", show: bool = True, save_to: SaveTo = None,
+               max_points: int = MAX_POINTS) -> None:
+    # Plot rectangle + reported points; reported may be a list of points or
+    # an index array into a PointArray2D, as range_search returns them
+    xs, ys = _xy(points)
+    fig, ax = _figure(save_to)
+    _cloud(ax, xs, ys, max_points, label="points")
 
     rx = [r.xmin, r.xmax, r.xmax, r.xmin, r.xmin]
     ry = [r.ymin, r.ymin, r.ymax, r.ymax, r.ymin]
-    plt.plot(rx, ry, label="rectangle")
-
-    if reported:
-        rxs = [p.x for p in reported]
-        rys = [p.y for p in reported]
-        plt.scatter(rxs, rys, marker="x", s=120, label="reported")
+    ax.plot(rx, ry, label="rectangle")
 
-    plt.title(title)
-    plt.axis("equal")
-    plt.legend()
-    plt.show()
\ No newline at end of file
+    if len(reported):
+        if isinstance(reported, np.ndarray):
+            rxs, rys = xs[reported], ys[reported]
+        else:
+            rxs, rys = _xy(reported)
+        rxs, rys = _thin(rxs, rys, max_points)
+        ax.scatter(rxs, rys, marker="x", s=120 if len(rxs) < 1000 else 10, label="reported")
+
+    ax.set_title(title)
+    ax.axis("equal")
+    ax.legend()
+    _finish(fig, save_to, show)
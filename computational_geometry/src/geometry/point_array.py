@@ -0,0 +1,149 @@
+from __future__ import annotations
+from typing import Iterable, Iterator
+import numpy as np
+from .primitives2d import Point2D
+from .primitives3d import Point3D
+
+
+class PointArray2D:
+    # Struct-of-arrays 2D point set: row 0 holds x, row 1 holds y
+    __slots__ = ("data",)
+
+    def __init__(self, data: np.ndarray) -> None:
+        data = np.ascontiguousarray(data, dtype=np.float64)
+        if data.ndim != 2 or data.shape[0] != 2:
+            raise ValueError("PointArray2D expects an array of shape (2, n)")
+        self.data = data
+
+    @classmethod
+    def from_xy(cls, xs: Iterable[float], ys: Iterable[float]) -> "PointArray2D":
+        return cls(np.vstack([np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)]))
+
+    @classmethod
+    def from_points(cls, points: Iterable[Point2D]) -> "PointArray2D":
+        pts = list(points)
+        data = np.empty((2, len(pts)), dtype=np.float64)
+        data[0] = [p.x for p in pts]
+        data[1] = [p.y for p in pts]
+        return cls(data)
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.data[0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.data[1]
+
+    def __len__(self) -> int:
+        return self.data.shape[1]
+
+    def __getitem__(self, key):
+        # Integer -> Point2D, slice -> view, index array -> copy
+        if isinstance(key, (int, np.integer)):
+            return Point2D(float(self.data[0, key]), float(self.data[1, key]))
+        return PointArray2D._wrap(self.data[:, key])
+
+    def __iter__(self) -> Iterator[Point2D]:
+        for x, y in zip(self.data[0].tolist(), self.data[1].tolist()):
+            yield Point2D(x, y)
+
+    def __repr__(self) -> str:
+        return f"PointArray2D(n={len(self)})"
+
+    def take(self, idx) -> "PointArray2D":
+        return PointArray2D._wrap(self.data[:, np.asarray(idx, dtype=np.intp)])
+
+    def to_points(self) -> list[Point2D]:
+        return list(self)
+
+    @classmethod
+    def _wrap(cls, data: np.ndarray) -> "PointArray2D":
+        # Skip the copy in __init__ so slices stay views
+        obj = cls.__new__(cls)
+        obj.data = data
+        return obj
+
+
+class PointArray3D:
+    # Struct-of-arrays 3D point set: rows hold x, y, z
+    __slots__ = ("data",)
+
+    def __init__(self, data: np.ndarray) -> None:
+        data = np.ascontiguousarray(data, dtype=np.float64)
+        if data.ndim != 2 or data.shape[0] != 3:
+            raise ValueError("PointArray3D expects an array of shape (3, n)")
+        self.data = data
+
+    @classmethod
+    def from_xyz(cls, xs: Iterable[float], ys: Iterable[float], zs: Iterable[float]) -> "PointArray3D":
+        return cls(np.vstack([
+            np.asarray(xs, dtype=np.float64),
+            np.asarray(ys, dtype=np.float64),
+            np.asarray(zs, dtype=np.float64),
+        ]))
+
+    @classmethod
+    def from_points(cls, points: Iterable[Point3D]) -> "PointArray3D":
+        pts = list(points)
+        data = np.empty((3, len(pts)), dtype=np.float64)
+        data[0] = [p.x for p in pts]
+        data[1] = [p.y for p in pts]
+        data[2] = [p.z for p in pts]
+        return cls(data)
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.data[0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.data[1]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self.data[2]
+
+    def __len__(self) -> int:
+        return self.data.shape[1]
+
+    def __getitem__(self, key):
+        # Integer -> Point3D, slice -> view, index array -> copy
+        if isinstance(key, (int, np.integer)):
+            return Point3D(float(self.data[0, key]), float(self.data[1, key]), float(self.data[2, key]))
+        return PointArray3D._wrap(self.data[:, key])
+
+    def __iter__(self) -> Iterator[Point3D]:
+        for x, y, z in zip(self.data[0].tolist(), self.data[1].tolist(), self.data[2].tolist()):
+            yield Point3D(x, y, z)
+
+    def __repr__(self) -> str:
+        return f"PointArray3D(n={len(self)})"
+
+    def take(self, idx) -> "PointArray3D":
+        return PointArray3D._wrap(self.data[:, np.asarray(idx, dtype=np.intp)])
+
+    def to_points(self) -> list[Point3D]:
+        return list(self)
+
+    @classmethod
+    def _wrap(cls, data: np.ndarray) -> "PointArray3D":
+        obj = cls.__new__(cls)
+        obj.data = data
+        return obj
+
+
+PointArray = PointArray2D | PointArray3D
+
+
+def unique_sorted_indices(pa: PointArray) -> np.ndarray:
+    # Indices of the distinct points, in lexicographic (x, y[, z]) order
+    n = len(pa)
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+    order = np.lexsort(pa.data[::-1])
+    srt = pa.data[:, order]
+    keep = np.empty(n, dtype=bool)
+    keep[0] = True
+    keep[1:] = np.any(srt[:, 1:] != srt[:, :-1], axis=0)
+    return order[keep]
@@ -0,0 +1,91 @@
+from __future__ import annotations
+import os
+import struct
+from typing import Iterator
+import numpy as np
+from .primitives2d import Point2D
+from .primitives3d import Point3D
+from .point_array import PointArray, PointArray2D, PointArray3D
+
+# On-disk point file: a 16-byte header (magic, version, dim, count) followed
+# by the coordinates as raw little-endian float64, one point per row
+# (x, y[, z]), so any run of consecutive points is one contiguous block
+MAGIC = b"CGPT"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+CHUNK_SIZE = 1 << 20   # points per chunk in the chunked drivers
+
+
+def _as_rows(points: PointArray | list[Point2D] | list[Point3D]) -> np.ndarray:
+    # (n, dim) float64 rows from either point representation
+    if isinstance(points, (PointArray2D, PointArray3D)):
+        return points.data.T
+    pts = list(points)
+    if pts and isinstance(pts[0], Point3D):
+        return np.array([(p.x, p.y, p.z) for p in pts], dtype=np.float64).reshape(-1, 3)
+    return np.array([(p.x, p.y) for p in pts], dtype=np.float64).reshape(-1, 2)
+
+
+def read_header(path: str | os.PathLike) -> tuple[int, int]:
+    # (dim, count) of a point file
+    with open(path, "rb") as f:
+        magic, version, dim, n = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a point file")
+    return dim, n
+
+
+def create_points(path: str | os.PathLike, n: int, dim: int = 2) -> np.memmap:
+    # New file with room for n points, mapped for writing
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, dim, n))
+        f.truncate(HEADER.size + 8 * dim * n)
+    return open_points(path, mode="r+")
+
+
+def write_points(path: str | os.PathLike, points: PointArray | list[Point2D] | list[Point3D]) -> None:
+    rows = _as_rows(points)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, rows.shape[1], rows.shape[0]))
+        f.write(np.ascontiguousarray(rows, dtype="<f8").tobytes())
+
+
+def append_points(path: str | os.PathLike, points: PointArray | list[Point2D] | list[Point3D]) -> None:
+    # Add points at the end, so files larger than memory can be written in pieces
+    if not os.path.exists(path):
+        write_points(path, points)
+        return
+    dim, n = read_header(path)
+    rows = _as_rows(points)
+    if len(rows) and rows.shape[1] != dim:
+        raise ValueError(f"{path} holds {dim}D points")
+    with open(path, "r+b") as f:
+        f.seek(HEADER.size + 8 * dim * n)
+        f.write(np.ascontiguousarray(rows, dtype="<f8").tobytes())
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, dim, n + len(rows)))
+
+
+def open_points(path: str | os.PathLike, mode: str = "r") -> np.memmap:
+    # Memory-mapped (n, dim) view of the coordinates
+    dim, n = read_header(path)
+    if n == 0:
+        return np.empty((0, dim), dtype=np.float64)
+    return np.memmap(path, dtype="<f8", mode=mode, offset=HEADER.size, shape=(n, dim))
+
+
+def point_array(rows: np.ndarray) -> PointArray:
+    # In-memory PointArray2D/3D copy of (k, dim) rows
+    return PointArray2D(rows.T) if rows.shape[1] == 2 else PointArray3D(rows.T)
+
+
+def iter_chunks(path: str | os.PathLike, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[int, PointArray]]:
+    # (offset of the first point, points) for consecutive runs of chunk_size points
+    mm = open_points(path)
+    for lo in range(0, len(mm), chunk_size):
+        yield lo, point_array(mm[lo : lo + chunk_size])
+
+
+def load_points(path: str | os.PathLike) -> PointArray:
+    # Whole file in memory
+    return point_array(open_points(path))
@@ -1,19 +1,370 @@
 from __future__ import annotations
+import math
+from collections import Counter
+from typing import Callable, Sequence
+import numpy as np
 from .primitives2d import Point2D
 from .primitives3d import Point3D
+from .point_array import PointArray2D, PointArray3D
+
+# Sign predicates (ccw, orient3d, incircle, ccw_cmp, det2) are adaptive in the
+# style of Shewchuk: the usual float expression is computed first and its sign
+# is returned when |det| exceeds a forward error bound (the filter). Otherwise
+# the determinant is recomputed exactly on integers, so the sign is always
+# that of the exact value. The value itself is the float estimate (or the
+# rounded exact value after a filter miss). Batched forms first try one
+# static bound for the whole batch, then the per-element bounds.
+
+EPSILON = 2.0 ** -53
+CCW_ERR = (3.0 + 16.0 * EPSILON) * EPSILON
+O3D_ERR = (7.0 + 56.0 * EPSILON) * EPSILON
+ICC_ERR = (10.0 + 96.0 * EPSILON) * EPSILON
+
+# Filter misses: evaluations that fell back to exact arithmetic, per predicate
+# (batched predicates count one per element)
+EXACT: Counter = Counter()
+
+
+def _exact(*vals: float) -> tuple[list[int], int]:
+    # Integers n_i and one exponent e with vals[i] == n_i * 2**e exactly
+    parts = [math.frexp(v) for v in vals]
+    if not all(math.isfinite(m) for m, _ in parts):
+        raise ValueError("predicates need finite coordinates")
+    e = min((k for m, k in parts if m), default=0) - 53
+    return [int(math.ldexp(m, 53)) << (k - 53 - e) if m else 0 for m, k in parts], e
+
+
+def _float(n: int, e: int) -> float:
+    # n * 2**e rounded to a float that keeps the sign of n
+    if n == 0:
+        return 0.0
+    b = n.bit_length()
+    if b > 64:
+        n >>= b - 64
+        e += b - 64
+    try:
+        v = math.ldexp(float(n), e)
+    except OverflowError:
+        return math.copysign(math.inf, n)
+    return v if v else math.copysign(5e-324, n)
+
+
+# Determinants written once for floats, Python ints and object arrays of ints;
+# DEGREE is the power of the coordinates in each term
+
+def _ccw_det(ax, ay, bx, by, cx, cy):
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+def _orient3d_det(ax, ay, az, bx, by, bz, cx, cy, cz, dx, dy, dz):
+    abx, aby, abz = bx - ax, by - ay, bz - az
+    acx, acy, acz = cx - ax, cy - ay, cz - az
+    adx, ady, adz = dx - ax, dy - ay, dz - az
+    return abx*(acy*adz - acz*ady) - acx*(aby*adz - abz*ady) + adx*(aby*acz - abz*acy)
+
+
+def _incircle_det(ax, ay, bx, by, cx, cy, dx, dy):
+    adx, ady = ax - dx, ay - dy
+    bdx, bdy = bx - dx, by - dy
+    cdx, cdy = cx - dx, cy - dy
+    return ((adx*adx + ady*ady) * (bdx*cdy - cdx*bdy)
+            + (bdx*bdx + bdy*bdy) * (cdx*ady - adx*cdy)
+            + (cdx*cdx + cdy*cdy) * (adx*bdy - bdx*ady))
+
+
+def _det2(a, b, c, d):
+    return a * d - b * c
+
+
+def _ccw_cmp_det(ax, ay, bx, by, px, py, qx, qy):
+    return (bx - ax) * (py - qy) - (by - ay) * (px - qx)
+
+
+DEGREE = {_ccw_det: 2, _orient3d_det: 3, _incircle_det: 4, _det2: 2, _ccw_cmp_det: 2}
+
+# Batches get a second filter stage before exact arithmetic: the same
+# expression in extended precision, where numpy's longdouble has it (x86).
+# Bounds use the double-precision permanent, hence the extra slack factor.
+LONG_EPS = float(np.finfo(np.longdouble).eps) / 2
+LONG_ERR = {det: (c + 64.0 * LONG_EPS) * LONG_EPS * (1.0 + 16.0 * EPSILON)
+            for det, c in ((_ccw_det, 3.0), (_orient3d_det, 7.0), (_incircle_det, 10.0))}
+
+
+def _exact_det(det: Callable, *vals: float) -> float:
+    # det evaluated exactly on integers, rounded back to a float
+    ns, e = _exact(*vals)
+    return _float(det(*ns), DEGREE[det] * e)
+
 
 def ccw(a: Point2D, b: Point2D, c: Point2D) -> float:
-    # Orientation test in 2D (left/right/collinear)
-    return (b.x - a.x) * (c.y - a.y) - (b.y - a.y) * (c.x - a.x)
+    # Orientation test in 2D (left/right/collinear); same filter as ccw_xy,
+    # inlined because this is the inner loop of the list-based hulls
+    l = (b.x - a.x) * (c.y - a.y)
+    r = (b.y - a.y) * (c.x - a.x)
+    det = l - r
+    if l > 0:
+        if r <= 0:
+            return det
+        s = l + r
+    elif l < 0:
+        if r >= 0:
+            return det
+        s = -l - r
+    else:
+        return det
+    if det >= CCW_ERR * s or -det >= CCW_ERR * s:
+        return det
+    EXACT["ccw"] += 1
+    return _exact_det(_ccw_det, a.x, a.y, b.x, b.y, c.x, c.y)
+
+
+def ccw_xy(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> float:
+    # ccw on raw coordinates, for index-based code that keeps xs/ys lists
+    l = (bx - ax) * (cy - ay)
+    r = (by - ay) * (cx - ax)
+    det = l - r
+    if l > 0:
+        if r <= 0:
+            return det    # terms of opposite sign cannot cancel
+        s = l + r
+    elif l < 0:
+        if r >= 0:
+            return det
+        s = -l - r
+    else:
+        return det
+    if det >= CCW_ERR * s or -det >= CCW_ERR * s:
+        return det
+    EXACT["ccw_xy"] += 1
+    return _exact_det(_ccw_det, ax, ay, bx, by, cx, cy)
+
+
+def ccw_cmp(a: Point2D, b: Point2D, p: Point2D, q: Point2D) -> float:
+    # Exact sign of ccw(a, b, p) - ccw(a, b, q): positive when p lies farther
+    # to the left of the line a->b than q
+    l = (b.x - a.x) * (p.y - q.y)
+    r = (b.y - a.y) * (p.x - q.x)
+    det = l - r
+    s = abs(l) + abs(r)
+    if det >= CCW_ERR * s or -det >= CCW_ERR * s:
+        return det
+    EXACT["ccw_cmp"] += 1
+    return _exact_det(_ccw_cmp_det, a.x, a.y, b.x, b.y, p.x, p.y, q.x, q.y)
+
 
 def dist2(a: Point2D, b: Point2D) -> float:
     # Squared Euclidean distance
     return (a.x - b.x)**2 + (a.y - b.y)**2
 
+
 def orient3d(a: Point3D, b: Point3D, c: Point3D, d: Point3D) -> float:
     # Orientation test in 3D (positive/negative/zero)
     abx, aby, abz = b.x - a.x, b.y - a.y, b.z - a.z
     acx, acy, acz = c.x - a.x, c.y - a.y, c.z - a.z
     adx, ady, adz = d.x - a.x, d.y - a.y, d.z - a.z
+    p1, p2 = acy*adz, acz*ady
+    p3, p4 = aby*adz, abz*ady
+    p5, p6 = aby*acz, abz*acy
+
+    det = abx*(p1 - p2) - acx*(p3 - p4) + adx*(p5 - p6)
+    perm = abs(abx)*(abs(p1) + abs(p2)) + abs(acx)*(abs(p3) + abs(p4)) + abs(adx)*(abs(p5) + abs(p6))
+    if det > O3D_ERR * perm or -det > O3D_ERR * perm or perm == 0:
+        return det
+    EXACT["orient3d"] += 1
+    return _exact_det(_orient3d_det, a.x, a.y, a.z, b.x, b.y, b.z, c.x, c.y, c.z, d.x, d.y, d.z)
+
+
+def incircle_xy(ax: float, ay: float, bx: float, by: float, cx: float, cy: float, dx: float, dy: float) -> float:
+    # Positive when d lies inside the circle through a, b, c (in CCW order),
+    # negative outside, zero on it
+    adx, ady = ax - dx, ay - dy
+    bdx, bdy = bx - dx, by - dy
+    cdx, cdy = cx - dx, cy - dy
+    bc, cb = bdx*cdy, cdx*bdy
+    ca, ac = cdx*ady, adx*cdy
+    ab, ba = adx*bdy, bdx*ady
+    alift, blift, clift = adx*adx + ady*ady, bdx*bdx + bdy*bdy, cdx*cdx + cdy*cdy
+
+    det = alift*(bc - cb) + blift*(ca - ac) + clift*(ab - ba)
+    perm = (abs(bc) + abs(cb))*alift + (abs(ca) + abs(ac))*blift + (abs(ab) + abs(ba))*clift
+    if det > ICC_ERR * perm or -det > ICC_ERR * perm or perm == 0:
+        return det
+    EXACT["incircle_xy"] += 1
+    return _exact_det(_incircle_det, ax, ay, bx, by, cx, cy, dx, dy)
+
+
+def incircle(a: Point2D, b: Point2D, c: Point2D, d: Point2D) -> float:
+    # In-circle test (see incircle_xy)
+    return incircle_xy(a.x, a.y, b.x, b.y, c.x, c.y, d.x, d.y)
+
+
+def det2(a: float, b: float, c: float, d: float) -> float:
+    # a*d - b*c with an exact sign, e.g. to tell parallel lines apart
+    l, r = a * d, b * c
+    det = l - r
+    s = abs(l) + abs(r)
+    if det > CCW_ERR * s or -det > CCW_ERR * s or s == 0:
+        return det
+    EXACT["det2"] += 1
+    return _exact_det(_det2, a, b, c, d)
+
+
+# Batch forms: any argument may be a single point or many points
+# (a PointArray or a sequence of points); the result is an array over the many
+
+Points2D = Point2D | PointArray2D | Sequence[Point2D]
+Points3D = Point3D | PointArray3D | Sequence[Point3D]
+
+
+def _xy(p: Points2D):
+    if isinstance(p, Point2D):
+        return p.x, p.y
+    if isinstance(p, PointArray2D):
+        return p.x, p.y
+    return np.fromiter((q.x for q in p), np.float64, len(p)), np.fromiter((q.y for q in p), np.float64, len(p))
+
+
+def _xyz(p: Points3D):
+    if isinstance(p, Point3D):
+        return p.x, p.y, p.z
+    if isinstance(p, PointArray3D):
+        return p.x, p.y, p.z
+    n = len(p)
+    return (np.fromiter((q.x for q in p), np.float64, n),
+            np.fromiter((q.y for q in p), np.float64, n),
+            np.fromiter((q.z for q in p), np.float64, n))
+
+
+# Below this many elements the per-element bound costs no more than the static one
+STATIC_MIN = 64
+
+
+def _amax(v) -> float:
+    return float(np.max(abs(v)))
+
+
+def _settle(det: np.ndarray, unsure: np.ndarray, perm: np.ndarray, exact: Callable, coords: tuple, name: str) -> np.ndarray:
+    # Recompute the elements the filter could not decide: in extended
+    # precision first, then the rest all at once on an object array of
+    # Python ints sharing one exponent
+    idx = np.flatnonzero(unsure)
+    V = np.empty((len(coords), len(idx)))
+    for row, v in zip(V, coords):
+        if isinstance(v, np.ndarray) and v.ndim:
+            v = (v if v.shape == det.shape else np.broadcast_to(v, det.shape)).reshape(-1)[idx]
+        row[:] = v
+    if not np.isfinite(V).all():
+        raise ValueError("predicates need finite coordinates")
+    EXACT[name] += len(idx)
+
+    flat = det.reshape(-1)
+    if LONG_EPS < EPSILON:
+        long = exact(*V.astype(np.longdouble))
+        ok = abs(long) > LONG_ERR[exact] * np.broadcast_to(perm, det.shape).reshape(-1)[idx]
+        # Rounding to double cannot flip a sign, but may underflow to zero
+        flat[idx[ok]] = np.where(long[ok] > 0, np.maximum(long[ok], 5e-324), np.minimum(long[ok], -5e-324))
+        idx, V = idx[~ok], V[:, ~ok]
+        if not len(idx):
+            return det
+
+    m, k = np.frexp(V)
+    e = (int(k[m != 0].min()) if m.any() else 0) - 53
+    ints = np.ldexp(m, 53).astype(np.int64).astype(object) << np.maximum(k - 53 - e, 0).astype(object)
+    res = exact(*ints)
+
+    try:
+        out = np.ldexp(res.astype(np.float64), DEGREE[exact] * e)
+    except OverflowError:
+        out = np.array([_float(int(n), DEGREE[exact] * e) for n in res])
+    # Underflow must not turn a nonzero sign into zero
+    tiny = out == 0
+    out[tiny & (res > 0).astype(bool)] = 5e-324
+    out[tiny & (res < 0).astype(bool)] = -5e-324
+
+    flat[idx] = out
+    return det
+
+
+def ccw_batch(a: Points2D, b: Points2D, c: Points2D) -> np.ndarray:
+    # ccw for many triples at once, e.g. line A->B against N points
+    ax, ay = _xy(a)
+    bx, by = _xy(b)
+    cx, cy = _xy(c)
+    ux, uy = bx - ax, by - ay
+    vx, vy = cx - ax, cy - ay
+    l, r = ux * vy, uy * vx
+    det = np.array(l - r, dtype=np.float64)
+    if det.size == 0:
+        return det
+
+    # Static filter: one bound for the whole batch from its largest differences;
+    # if any element fails it, the per-element (dynamic) bound decides
+    if det.size >= STATIC_MIN:
+        static = CCW_ERR * (_amax(ux) * _amax(vy) + _amax(uy) * _amax(vx))
+        if abs(det).min() >= static:
+            return det
+    perm = abs(l) + abs(r)
+    unsure = abs(det) < CCW_ERR * perm
+    if unsure.any():
+        return _settle(det, unsure, perm, _ccw_det, (ax, ay, bx, by, cx, cy), "ccw_batch")
+    return det
+
+
+def dist2_batch(a: Points2D, b: Points2D) -> np.ndarray:
+    # Squared distances for many pairs at once
+    ax, ay = _xy(a)
+    bx, by = _xy(b)
+    return np.asarray((ax - bx)**2 + (ay - by)**2, dtype=np.float64)
+
+
+def orient3d_batch(a: Points3D, b: Points3D, c: Points3D, d: Points3D) -> np.ndarray:
+    # orient3d for many quadruples at once, e.g. one face against N points
+    ax, ay, az = _xyz(a)
+    bx, by, bz = _xyz(b)
+    cx, cy, cz = _xyz(c)
+    dx, dy, dz = _xyz(d)
+    abx, aby, abz = bx - ax, by - ay, bz - az
+    acx, acy, acz = cx - ax, cy - ay, cz - az
+    adx, ady, adz = dx - ax, dy - ay, dz - az
+    p1, p2 = acy*adz, acz*ady
+    p3, p4 = aby*adz, abz*ady
+    p5, p6 = aby*acz, abz*acy
+
+    det = np.array(abx*(p1 - p2) - acx*(p3 - p4) + adx*(p5 - p6), dtype=np.float64)
+    if det.size == 0:
+        return det
+    if det.size >= STATIC_MIN:
+        M = [_amax(v) for v in (abx, aby, abz, acx, acy, acz, adx, ady, adz)]
+        static = M[0]*(M[4]*M[8] + M[5]*M[7]) + M[3]*(M[1]*M[8] + M[2]*M[7]) + M[6]*(M[1]*M[5] + M[2]*M[4])
+        if static == 0 or abs(det).min() > O3D_ERR * static:
+            return det
+    # builtin abs: cheaper than np.abs on the scalars of one-point arguments
+    perm = abs(abx)*(abs(p1) + abs(p2)) + abs(acx)*(abs(p3) + abs(p4)) + abs(adx)*(abs(p5) + abs(p6))
+    unsure = abs(det) <= O3D_ERR * perm
+    if unsure.any():
+        return _settle(det, unsure, perm, _orient3d_det, (ax, ay, az, bx, by, bz, cx, cy, cz, dx, dy, dz), "orient3d_batch")
+    return det
+
+
+def incircle_batch(a: Points2D, b: Points2D, c: Points2D, d: Points2D) -> np.ndarray:
+    # incircle for many quadruples at once, e.g. one triangle against N points
+    ax, ay = _xy(a)
+    bx, by = _xy(b)
+    cx, cy = _xy(c)
+    dx, dy = _xy(d)
+    adx, ady = ax - dx, ay - dy
+    bdx, bdy = bx - dx, by - dy
+    cdx, cdy = cx - dx, cy - dy
+    bc, cb = bdx*cdy, cdx*bdy
+    ca, ac = cdx*ady, adx*cdy
+    ab, ba = adx*bdy, bdx*ady
+    alift, blift, clift = adx*adx + ady*ady, bdx*bdx + bdy*bdy, cdx*cdx + cdy*cdy
 
-    return abx*(acy*adz - acz*ady) - acx*(aby*adz - abz*ady) + adx*(aby*acz - abz*acy)
\ No newline at end of file
+    det = np.array(alift*(bc - cb) + blift*(ca - ac) + clift*(ab - ba), dtype=np.float64)
+    if det.size == 0:
+        return det
+    perm = (abs(bc) + abs(cb))*alift + (abs(ca) + abs(ac))*blift + (abs(ab) + abs(ba))*clift
+    unsure = abs(det) <= ICC_ERR * perm
+    if unsure.any():
+        return _settle(det, unsure, perm, _incircle_det, (ax, ay, bx, by, cx, cy, dx, dy), "incircle_batch")
+    return det
@@ -1,7 +1,11 @@
 from __future__ import annotations
+import math
 import random
+from typing import Callable, Iterator, Optional
+import numpy as np
 from .primitives2d import Point2D
 from .primitives3d import Point3D
+from .point_array import PointArray, PointArray2D, PointArray3D
 
 def random_points_2d(n: int, seed: int = 0, lo: float = 0.0, hi: float = 1000.0) -> list[Point2D]:
     # Generate n random 2D points
@@ -27,4 +31,95 @@ def random_points_3d(n: int, seed: int = 0, lo: float = 0.0, hi: float = 1000.0)
         p = Point3D(x, y, z)
         points.append(p)
 
-    return points
\ No newline at end of file
+    return points
+
+# Vectorized generators. Each returns a PointArray2D (PointArray3D for
+# uniform_box with dim=3), or with chunk_size set an iterator of arrays of at
+# most chunk_size points; the chunks concatenate to exactly the full array
+# for the same seed. Draws are taken per point in one block, which is what
+# keeps the two forms identical.
+
+def _rows_to_array(rows: np.ndarray) -> PointArray:
+    return PointArray2D(rows.T) if rows.shape[1] == 2 else PointArray3D(rows.T)
+
+
+def _generate(n: int, rng: np.random.Generator, chunk_size: Optional[int],
+              draw: Callable[[np.random.Generator, int], np.ndarray]) -> PointArray | Iterator[PointArray]:
+    # draw(rng, k) returns k points as (k, dim) rows
+    if chunk_size is None:
+        return _rows_to_array(draw(rng, n))
+    return _chunks(rng, n, chunk_size, draw)
+
+
+def _chunks(rng: np.random.Generator, n: int, chunk_size: int, draw) -> Iterator[PointArray]:
+    for lo in range(0, n, chunk_size):
+        yield _rows_to_array(draw(rng, min(chunk_size, n - lo)))
+
+
+def uniform_box(n: int, seed: int = 0, lo: float = 0.0, hi: float = 1000.0, dim: int = 2,
+                chunk_size: Optional[int] = None) -> PointArray | Iterator[PointArray]:
+    # Same distribution as random_points_2d / random_points_3d
+    return _generate(n, np.random.default_rng(seed), chunk_size, lambda rng, k: lo + (hi - lo) * rng.random((k, dim)))
+
+
+def uniform_disk(n: int, seed: int = 0, center: tuple[float, float] = (500.0, 500.0), radius: float = 500.0,
+                 chunk_size: Optional[int] = None) -> PointArray2D | Iterator[PointArray2D]:
+    def draw(rng: np.random.Generator, k: int) -> np.ndarray:
+        u = rng.random((k, 2))
+        r = radius * np.sqrt(u[:, 0])
+        t = 2 * np.pi * u[:, 1]
+        return np.column_stack([center[0] + r * np.cos(t), center[1] + r * np.sin(t)])
+    return _generate(n, np.random.default_rng(seed), chunk_size, draw)
+
+
+def on_circle(n: int, seed: int = 0, center: tuple[float, float] = (500.0, 500.0), radius: float = 500.0,
+              chunk_size: Optional[int] = None) -> PointArray2D | Iterator[PointArray2D]:
+    # Every point is a hull vertex: worst case for output-sensitive hulls
+    def draw(rng: np.random.Generator, k: int) -> np.ndarray:
+        t = 2 * np.pi * rng.random(k)
+        return np.column_stack([center[0] + radius * np.cos(t), center[1] + radius * np.sin(t)])
+    return _generate(n, np.random.default_rng(seed), chunk_size, draw)
+
+
+def gaussian_clusters(n: int, seed: int = 0, clusters: int = 8, spread: float = 20.0,
+                      lo: float = 0.0, hi: float = 1000.0,
+                      chunk_size: Optional[int] = None) -> PointArray2D | Iterator[PointArray2D]:
+    # Isotropic normal blobs (std dev `spread`) around centers uniform in the box
+    rng = np.random.default_rng(seed)
+    centers = lo + (hi - lo) * rng.random((clusters, 2))
+
+    def draw(rng: np.random.Generator, k: int) -> np.ndarray:
+        u = rng.random((k, 3))
+        label = np.minimum((u[:, 0] * clusters).astype(np.intp), clusters - 1)
+        # Box-Muller on the other two uniforms
+        r = spread * np.sqrt(-2.0 * np.log1p(-u[:, 1]))
+        t = 2 * np.pi * u[:, 2]
+        return centers[label] + np.column_stack([r * np.cos(t), r * np.sin(t)])
+    return _generate(n, rng, chunk_size, draw)
+
+
+def near_collinear(n: int, seed: int = 0, lo: float = 0.0, hi: float = 1000.0, noise: Optional[float] = None,
+                   chunk_size: Optional[int] = None) -> PointArray2D | Iterator[PointArray2D]:
+    # Points on the diagonal y = x pushed off it by at most `noise`. The
+    # default, a few ulps of the largest coordinate, puts the offsets at the
+    # scale of the rounding error of orientation tests, so most of them need
+    # the exact fallback; larger noise gives merely thin input
+    if noise is None:
+        noise = 4 * np.finfo(np.float64).eps * max(abs(lo), abs(hi), 1.0)
+
+    def draw(rng: np.random.Generator, k: int) -> np.ndarray:
+        u = rng.random((k, 2))
+        t = lo + (hi - lo) * u[:, 0]
+        return np.column_stack([t, t + noise * (2 * u[:, 1] - 1)])
+    return _generate(n, np.random.default_rng(seed), chunk_size, draw)
+
+
+def grid(n: int, seed: int = 0, side: Optional[int] = None, spacing: float = 1.0,
+         chunk_size: Optional[int] = None) -> PointArray2D | Iterator[PointArray2D]:
+    # Points drawn from a side x side lattice (default side ~ sqrt(n)): many
+    # collinear triples, cocircular quadruples and exact duplicates
+    m = side if side is not None else max(1, math.isqrt(max(n - 1, 0)) + 1)
+
+    def draw(rng: np.random.Generator, k: int) -> np.ndarray:
+        return spacing * np.floor(rng.random((k, 2)) * m)
+    return _generate(n, np.random.default_rng(seed), chunk_size, draw)